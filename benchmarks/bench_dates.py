@@ -0,0 +1,138 @@
+# benchmarks/bench_dates.py
+"""
+Times CompleteDate parsing and report-window filtering: the per-main code
+the original scripts ran against the shared normalization stage in
+src/dates.py.
+
+Paths per scale:
+  legacy       each main on its own: pd.to_datetime without a format, the
+               daily tab's `.dt.date` object column compared to a date
+               scalar, then a boolean mask and a full .copy()
+  current      normalize_dates once, split_windows over every report,
+               plain_dates for the daily tab
+  parse_text   the same two parses over ISO text instead of driver datetimes
+
+Both row orders are timed: the query's ORDER BY Task (unsorted dates) and
+the task store's date-sorted partitions, where windows are searchsorted slices.
+
+Run from the project root:
+    uv run python -m benchmarks.bench_dates
+    uv run python -m benchmarks.bench_dates --rows 1000000 5000000 --repeat 5
+"""
+import argparse
+import contextlib
+import io
+import time
+from datetime import datetime
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from src.dates import DATE_COL, normalize_dates, plain_dates, split_windows
+from src.reports import REPORTS, ReportDefinition, Window
+from src.runner import combined_window
+
+# Same fixed "now" as bench_pipeline (a Wednesday 3 PM)
+BENCH_NOW = datetime(2025, 10, 15, 15, 0)
+
+DEFAULT_ROWS = [1_000_000]
+
+
+def best_of(func: Callable, repeat: int):
+    """Fastest of `repeat` calls (stdout silenced) and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def make_frame(n_rows: int, window: Window, seed: int = 42) -> pd.DataFrame:
+    """Task rows spread over `window` in ORDER BY Task order (dates unsorted)."""
+    rng = np.random.default_rng(seed)
+    start, end = (np.datetime64(t, "ms") for t in window)
+    offsets = rng.integers(0, (end - start).astype(np.int64), n_rows).astype("timedelta64[ms]")
+    techs = rng.integers(1000, 1060, n_rows)
+    return pd.DataFrame({
+        "CompletedBy": pd.Categorical(techs),
+        "Name": pd.Categorical([f"Tech{t} Surname{t}" for t in techs]),
+        "CaseNumber": (140000 + rng.integers(0, max(n_rows // 8, 1), n_rows)).astype(str),
+        DATE_COL: (start + offsets).astype("datetime64[ns]"),
+        "Duration": rng.choice([2.0, 5.0, 7.5, 10.0, 15.0, 30.0], n_rows),
+    })
+
+
+def legacy_report(data_df: pd.DataFrame, report: ReportDefinition, window: Window) -> pd.DataFrame:
+    """What main.py / main_midday.py did to their own copy of the query result."""
+    data_df = data_df.copy()
+    start_time, end_time = window
+    if report.date_only:
+        data_df[DATE_COL] = pd.to_datetime(data_df[DATE_COL]).dt.date
+        return data_df[data_df[DATE_COL] == start_time.date()].copy()
+
+    data_df[DATE_COL] = pd.to_datetime(data_df[DATE_COL], errors='coerce')
+    mask = (data_df[DATE_COL] >= start_time) & (data_df[DATE_COL] < end_time)
+    return data_df[mask].copy()
+
+
+def current_reports(data_df: pd.DataFrame, windows: Dict[str, Window]) -> Dict[str, pd.DataFrame]:
+    """The runner's path: one normalization, one split, plain dates where needed."""
+    data_df = normalize_dates(data_df)
+    frames = split_windows(data_df, windows)
+    for name, report_df in frames.items():
+        if REPORTS[name].date_only:
+            frames[name] = report_df.assign(**{DATE_COL: plain_dates(report_df[DATE_COL])})
+    return frames
+
+
+def bench_scale(n_rows: int, repeat: int) -> Dict[str, float]:
+    reports = list(REPORTS.values())
+    windows = {r.name: r.window(BENCH_NOW) for r in reports}
+    print(f"\nGenerating {n_rows:,} rows...")
+    unsorted_df = make_frame(n_rows, combined_window(list(windows.values())))
+    sorted_df = unsorted_df.sort_values(DATE_COL, kind="stable", ignore_index=True)
+
+    results: Dict[str, float] = {}
+    for order, data_df in (("unsorted", unsorted_df), ("sorted", sorted_df)):
+        results[f"legacy_{order}"], legacy = best_of(
+            lambda: {r.name: legacy_report(data_df, r, windows[r.name]) for r in reports}, repeat
+        )
+        results[f"current_{order}"], current = best_of(lambda: current_reports(data_df, windows), repeat)
+
+        # Same rows and the same plain dates either way
+        for r in reports:
+            pd.testing.assert_frame_equal(
+                legacy[r.name].reset_index(drop=True), current[r.name].reset_index(drop=True)
+            )
+
+    text = unsorted_df[DATE_COL].dt.strftime("%Y-%m-%d %H:%M:%S.%f").to_frame()
+    results["parse_text_legacy"], _ = best_of(
+        lambda: pd.to_datetime(text[DATE_COL].astype(object), errors='coerce'), repeat
+    )
+    results["parse_text_current"], _ = best_of(lambda: normalize_dates(text.copy()), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = {n_rows: bench_scale(n_rows, args.repeat) for n_rows in args.rows}
+
+    print(f"\n{'rows':>10} | {'path':<10} | {'legacy':>9} | {'current':>9} | speedup")
+    print("-" * 56)
+    for n_rows, r in results.items():
+        for path in ("unsorted", "sorted", "text"):
+            legacy = r[f"legacy_{path}"] if path != "text" else r["parse_text_legacy"]
+            current = r[f"current_{path}"] if path != "text" else r["parse_text_current"]
+            print(f"{n_rows:>10,} | {path:<10} | {legacy:>8.3f}s | {current:>8.3f}s | {legacy / current:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_fetch.py
+"""
+Compares the old pd.read_sql materialization (plus the mains' pd.to_datetime
+re-parse) against db_handler.rows_to_dataframe on synthetic rows.
+
+Paths:
+  read_sql   pd.read_sql of the old joined query (Name per row, object columns)
+  columnar   rows_to_dataframe of the same joined rows
+  compact    rows_to_dataframe of the current query plus attach_employee_names
+             (names mapped per CompletedBy category from employees.sql)
+
+Run from the project root:
+    uv run python -m benchmarks.bench_fetch --rows 100000 1000000
+"""
+import argparse
+import time
+import warnings
+
+import pandas as pd
+
+from src.db_handler import TASK_COLUMN_DTYPES, rows_to_dataframe
+from src.employees import attach_employee_names
+
+from .fake_db import FakeConnection
+from .synthetic import (
+    JOINED_TASK_DESCRIPTION,
+    TASK_DESCRIPTION,
+    make_employee_rows,
+    make_task_rows,
+)
+
+QUERY = "SELECT * FROM fake"
+
+
+def read_sql_path(conn: FakeConnection) -> pd.DataFrame:
+    """The previous path: pd.read_sql on a raw DB-API connection, then re-parse dates."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        df = pd.read_sql(QUERY, conn)
+    df["CompleteDate"] = pd.to_datetime(df["CompleteDate"], errors='coerce')
+    return df
+
+
+def columnar_path(conn: FakeConnection) -> pd.DataFrame:
+    """Fetch rows and build typed columns directly."""
+    cursor = conn.cursor()
+    cursor.execute(QUERY)
+    return rows_to_dataframe(cursor.fetchall(), cursor.description, TASK_COLUMN_DTYPES)
+
+
+def compact_path(conn: FakeConnection) -> pd.DataFrame:
+    """Typed columns without Name, then names joined once per technician."""
+    names = pd.Series(dict(conn.employees), name="Name")
+    return attach_employee_names(columnar_path(conn), names)
+
+
+def best_of(func, conn, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(conn)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} | {'path':<10} | {'seconds':>8} | {'MiB':>8} | dtypes")
+    print("-" * 90)
+
+    for n_rows in args.rows:
+        joined = FakeConnection(make_task_rows(n_rows, joined=True), JOINED_TASK_DESCRIPTION)
+        compact = FakeConnection(make_task_rows(n_rows), TASK_DESCRIPTION, employees=make_employee_rows())
+
+        for label, func, conn in (
+            ("read_sql", read_sql_path, joined),
+            ("columnar", columnar_path, joined),
+            ("compact", compact_path, compact),
+        ):
+            seconds, df = best_of(func, conn, args.repeat)
+            mib = df.memory_usage(deep=True).sum() / 2**20
+            dtypes = ", ".join(f"{c}={t}" for c, t in df.dtypes.astype(str).items())
+            print(f"{n_rows:>10,} | {label:<10} | {seconds:>8.3f} | {mib:>8.1f} | {dtypes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+# benchmarks/bench_pipeline.py
+"""
+Times the extract → filter → upload path end to end against local stand-ins:
+synthetic CaseTasksHistory rows served by a fake pyodbc connection, and an
+in-memory Google Sheets API behind gspread (every request and its JSON size
+is recorded). Nothing touches SQL Server or Google.
+
+Stages per scale:
+  fetch        execute_sql_to_dataframe over the combined report window
+  stream       iter_sql_dataframes + prepare_rows (the runner's streaming path:
+               dates parsed, employee names mapped per technician)
+  filter       split_reports + finish_report for every report (window slicing, plain dates)
+  upload_tab   write_dataframe_to_sheet of the daily report (gspread_dataframe path)
+  upload_batch write_dataframes_to_sheets of every report tab in one batch
+
+Run from the project root:
+    uv run python -m benchmarks.bench_pipeline --rows 10000 100000 1000000
+    uv run python -m benchmarks.bench_pipeline --save-baseline    # record benchmarks/baseline.json
+    uv run python -m benchmarks.bench_pipeline                    # compare against it
+
+Generating 10M rows takes a few minutes and several GB of RAM; uploads whose
+tab would exceed Google's 10M-cell limit are skipped.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+import src.db_pool as db_pool
+import src.employees as src_employees
+from src.db_handler import concat_frames, execute_sql_to_dataframe, iter_sql_dataframes
+from src.db_pool import ConnectionPool
+from src.reports import REPORTS
+from src.runner import SQL_FILE_PATH, combined_window, finish_report, prepare_rows, split_reports
+from src.sql_templates import window_params
+
+from .fake_db import FakeConnection
+from .fake_sheets import BENCH_SPREADSHEET_ID, BenchSheetsHandler
+from .synthetic import TASK_DESCRIPTION, make_employee_rows, make_task_rows
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+# Fixed "now" (a Wednesday 3 PM) so every report window is non-empty and runs are comparable
+BENCH_NOW = datetime(2025, 10, 15, 15, 0)
+
+# Google Sheets hard limit per spreadsheet
+MAX_SHEET_CELLS = 10_000_000
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+
+# Differences below this are timer noise at small scales, never a regression
+MIN_REGRESSION_SECONDS = 0.05
+
+
+def best_of(func: Callable, repeat: int):
+    """Fastest of `repeat` calls (stdout silenced) and the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = func()
+            best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def install_fake_database(rows: List[tuple]):
+    """Points the shared connection pool at a FakeConnection serving `rows`."""
+    employees = make_employee_rows()
+    db_pool._POOL = ConnectionPool(lambda: FakeConnection(rows, TASK_DESCRIPTION, employees=employees))
+    # Synthetic names must neither come from nor land in the real .cache/employees
+    src_employees.EMPLOYEE_CACHE_DIR = Path(tempfile.mkdtemp(prefix="bench-employees-"))
+    src_employees.get_employee_names(refresh=True)
+
+
+def bench_scale(n_rows: int, repeat: int) -> Dict[str, float]:
+    print(f"\nGenerating {n_rows:,} synthetic rows...")
+    install_fake_database(make_task_rows(n_rows, days=5, end=BENCH_NOW))
+
+    reports = list(REPORTS.values())
+    windows = {r.name: r.window(BENCH_NOW) for r in reports}
+    params = window_params(*combined_window(list(windows.values())))
+    results: Dict[str, float] = {}
+
+    results["fetch"], data_df = best_of(
+        lambda: execute_sql_to_dataframe(str(SQL_FILE_PATH), params=params), repeat
+    )
+    results["stream"], data_df = best_of(
+        lambda: concat_frames(list(iter_sql_dataframes(str(SQL_FILE_PATH), params=params, transform=prepare_rows))),
+        repeat,
+    )
+    results["filter"], report_frames = best_of(
+        lambda: {name: finish_report(REPORTS[name], df) for name, df in split_reports(data_df, windows).items()},
+        repeat,
+    )
+    results["rows"] = len(data_df)
+
+    daily_df = report_frames["daily"]
+    if (len(daily_df) + 1) * len(daily_df.columns) <= MAX_SHEET_CELLS:
+        handler = BenchSheetsHandler()
+        best_of(lambda: handler.write_dataframe_to_sheet(daily_df, REPORTS["daily"].sheet_name), 1)  # create the tab
+        handler.http.reset_calls()
+        results["upload_tab"], _ = best_of(
+            lambda: handler.write_dataframe_to_sheet(daily_df, REPORTS["daily"].sheet_name), repeat
+        )
+        results["upload_tab_requests"] = len(handler.http.calls) / repeat
+        results["upload_tab_bytes"] = handler.http.bytes_sent / repeat
+
+    tabs = {r.sheet_name: report_frames[r.name] for r in reports}
+    total_cells = sum((len(df) + 1) * len(df.columns) for df in tabs.values())
+    if total_cells <= MAX_SHEET_CELLS:
+        handler = BenchSheetsHandler().prepare()
+        best_of(lambda: handler.write_dataframes_to_sheets(tabs), 1)  # create the tabs
+        handler.http.reset_calls()
+        results["upload_batch"], _ = best_of(lambda: handler.write_dataframes_to_sheets(tabs), repeat)
+        results["upload_batch_requests"] = len(handler.http.calls) / repeat
+        results["upload_batch_bytes"] = handler.http.bytes_sent / repeat
+
+    return results
+
+
+def environment() -> dict:
+    import numpy
+    import pyarrow
+
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": numpy.__version__,
+        "pyarrow": pyarrow.__version__,
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: dict, tolerance: float) -> List[str]:
+    """Timing stages more than `tolerance` slower than the baseline (same row count only)."""
+    regressions = []
+    for scale, stages in results.items():
+        base = baseline.get("results", {}).get(scale)
+        if not base:
+            continue
+        for stage, seconds in stages.items():
+            if stage not in base or stage == "rows" or stage.endswith(("_requests", "_bytes")):
+                continue
+            if seconds > base[stage] * (1 + tolerance) and seconds - base[stage] > MIN_REGRESSION_SECONDS:
+                regressions.append(f"{scale} rows / {stage}: {seconds:.3f}s vs baseline {base[stage]:.3f}s")
+        for stage in ("upload_tab_requests", "upload_batch_requests"):
+            if stage in stages and stage in base and stages[stage] > base[stage]:
+                regressions.append(f"{scale} rows / {stage}: {stages[stage]:.0f} vs baseline {base[stage]:.0f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown vs baseline (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    os.environ["GOOGLE_SPREADSHEET_ID"] = BENCH_SPREADSHEET_ID
+
+    results: Dict[str, Dict[str, float]] = {}
+    for n_rows in args.rows:
+        results[str(n_rows)] = bench_scale(n_rows, args.repeat)
+
+    stages = ["fetch", "stream", "filter", "upload_tab", "upload_batch"]
+    print(f"\n{'rows':>10} | " + " | ".join(f"{s:>12}" for s in stages) + " | batch requests / MiB sent")
+    print("-" * 110)
+    for scale, r in results.items():
+        timings = " | ".join(f"{r[s]:>11.3f}s" if s in r else f"{'skipped':>12}" for s in stages)
+        batch = (f"{r['upload_batch_requests']:.0f} / {r['upload_batch_bytes'] / 2**20:.1f}"
+                 if "upload_batch" in r else "-")
+        print(f"{int(scale):>10,} | {timings} | {batch}")
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({"environment": environment(), "results": results}, indent=2) + "\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one.")
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nRegressions vs {args.baseline.name} (recorded {baseline['environment'].get('recorded_at')}):")
+        for line in regressions:
+            print(f"   {line}")
+        sys.exit(1)
+    print(f"\nNo regressions vs {args.baseline.name} (tolerance {args.tolerance:.0%}).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/fake_db.py
+from typing import List, Optional, Sequence, Tuple
+
+from .synthetic import EMPLOYEE_DESCRIPTION
+
+
+class FakeCursor:
+    """Minimal DB-API cursor that replays pre-built rows like pyodbc does."""
+
+    def __init__(self, rows: List[Tuple], description: Sequence, employees: Optional[List[Tuple]] = None):
+        self._all_rows = rows
+        self._rows: List[Tuple] = []
+        self._pos = 0
+        self._source_description = description
+        self._employees = employees or []
+        self.description = None
+        self.arraysize = 1
+        self.executed: List[Tuple[str, tuple]] = []
+
+    def execute(self, sql, *params):
+        if len(params) == 1 and isinstance(params[0], (list, tuple)):
+            params = tuple(params[0])
+        self.executed.append((sql, params))
+        self._pos = 0
+
+        if "dbo.employees" in sql and "CaseTasksHistory" not in sql:
+            # sql_query/employees.sql
+            self._rows = list(self._employees)
+            self.description = list(EMPLOYEE_DESCRIPTION)
+            return self
+
+        rows = self._all_rows
+        if len(params) >= 2:
+            # Emulate the [start, end) CompleteDate window in task_by_tech_eff.sql
+            date_index = [d[0] for d in self._source_description].index("CompleteDate")
+            start, end = params[0], params[1]
+            rows = [r for r in rows if start <= r[date_index] < end]
+
+        self._rows = rows
+        self.description = list(self._source_description)
+        return self
+
+    def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def fetchmany(self, size=None):
+        size = size or self.arraysize
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchone(self):
+        rows = self.fetchmany(1)
+        return rows[0] if rows else None
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """pyodbc.Connection stand-in; every cursor serves the same rows (and employees)."""
+
+    def __init__(self, rows: List[Tuple], description: Sequence, employees: Optional[List[Tuple]] = None):
+        self.rows = rows
+        self.description = description
+        self.employees = employees
+        self.closed = False
+        self.cursors: List[FakeCursor] = []
+
+    def cursor(self):
+        cursor = FakeCursor(self.rows, self.description, self.employees)
+        self.cursors.append(cursor)
+        return cursor
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
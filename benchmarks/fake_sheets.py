@@ -0,0 +1,298 @@
+# benchmarks/fake_sheets.py
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+from json import dumps
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote
+
+import gspread
+import requests
+from gspread.http_client import HTTPClient
+from gspread.urls import SPREADSHEETS_API_V4_BASE_URL
+from gspread.utils import a1_range_to_grid_range, rowcol_to_a1
+
+from src.sheets_handler import SheetsHandler
+
+BENCH_SPREADSHEET_ID = "benchmark-spreadsheet"
+
+
+def _response(payload: dict) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = dumps(payload).encode("utf-8")
+    return response
+
+
+SHEETS_EPOCH = datetime(1899, 12, 30)
+
+_NUMBER = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_TIME_OF_DAY = re.compile(r"(\d{1,2})(?::(\d{2})(?::(\d{2}))?)?\s*([AaPp][Mm])")
+
+
+class Serial(NamedTuple):
+    """A date, date-time or time cell: Sheets keeps a serial day number plus how to display it."""
+
+    days: float
+    kind: str  # "date", "datetime" or "time"
+
+
+def _entered(value):
+    """How Sheets stores a value written with USER_ENTERED."""
+    if isinstance(value, (bool, int, float)):
+        return value
+    text = str(value).strip()
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
+    if _NUMBER.fullmatch(text):
+        number = float(text)
+        return int(number) if number.is_integer() else number
+    if re.fullmatch(r"\d{4}-\d{2}-\d{2}.*", text):
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            return value
+        return Serial((parsed - SHEETS_EPOCH) / timedelta(days=1), "datetime" if len(text) > 10 else "date")
+    match = _TIME_OF_DAY.fullmatch(text)
+    if match:
+        hour, minute, second, half = match.groups()
+        hour = int(hour) % 12 + (12 if half.upper() == "PM" else 0)
+        return Serial((hour * 3600 + int(minute or 0) * 60 + int(second or 0)) / 86400, "time")
+    return value
+
+
+def _rendered(value, unformatted: bool):
+    """How the Sheets API hands a stored value back: FORMATTED_VALUE text, or UNFORMATTED_VALUE with SERIAL_NUMBER dates."""
+    if isinstance(value, Serial):
+        if unformatted:
+            return value.days
+        # en_US display formats; the text Sheets shows, not what was sent
+        moment = SHEETS_EPOCH + timedelta(days=value.days)
+        if value.kind == "date":
+            return f"{moment.month}/{moment.day}/{moment.year}"
+        if value.kind == "time":
+            return f"{moment.hour % 12 or 12}:{moment:%M:%S} {'AM' if moment.hour < 12 else 'PM'}"
+        return f"{moment.month}/{moment.day}/{moment.year} {moment.hour}:{moment:%M:%S}"
+    if unformatted or value == "":
+        return value
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class FakeSheetsHTTPClient(HTTPClient):
+    """
+    In-memory Google Sheets API behind gspread's HTTP client interface.
+
+    gspread builds its real requests (URLs, JSON bodies) and this class answers
+    them locally, so benchmarks include gspread's own serialization. Every
+    request is recorded with the size of its JSON body.
+    """
+
+    def __init__(self, auth=None, session=None):
+        self.timeout = None
+        self.calls: List[Tuple[str, str, int]] = []
+        # title -> sheet properties / grid of values
+        self.sheets: Dict[str, dict] = {}
+        self.values: Dict[str, List[list]] = {}
+        # sheetId -> developer metadata entries
+        self.developer_metadata: Dict[int, List[dict]] = {}
+        self._next_sheet_id = 1
+
+    # ---------------------------------------------------------------
+    # Recording
+    # ---------------------------------------------------------------
+    def reset_calls(self):
+        self.calls = []
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(size for _, _, size in self.calls)
+
+    def call_counts(self) -> Dict[str, int]:
+        return dict(Counter(kind for _, kind, _ in self.calls))
+
+    # ---------------------------------------------------------------
+    # Storage helpers
+    # ---------------------------------------------------------------
+    def _add_sheet(self, title: str, rows: int = 1000, cols: int = 26) -> dict:
+        properties = {
+            "sheetId": self._next_sheet_id,
+            "title": title,
+            "index": len(self.sheets),
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": int(rows), "columnCount": int(cols)},
+        }
+        self._next_sheet_id += 1
+        self.sheets[title] = properties
+        self.values[title] = []
+        return properties
+
+    def _title(self, sheet_id: int) -> str:
+        return next(title for title, props in self.sheets.items() if props["sheetId"] == sheet_id)
+
+    def _split_range(self, range_name: str) -> Tuple[str, Optional[dict]]:
+        if "!" in range_name:
+            title, cells = range_name.rsplit("!", 1)
+        else:
+            title, cells = range_name, None
+        title = title.strip("'").replace("''", "'")
+        return title, a1_range_to_grid_range(cells) if cells else None
+
+    def _write(self, range_name: str, rows: List[list], raw: bool = False):
+        if not raw:
+            rows = [[_entered(v) for v in row] for row in rows]
+        title, grid = self._split_range(range_name)
+        start_row = (grid or {}).get("startRowIndex", 0)
+        start_col = (grid or {}).get("startColumnIndex", 0)
+        grid_values = self.values.setdefault(title, [])
+
+        while len(grid_values) < start_row + len(rows):
+            grid_values.append([])
+        for i, row in enumerate(rows):
+            target = grid_values[start_row + i]
+            if len(target) < start_col + len(row):
+                target.extend([""] * (start_col + len(row) - len(target)))
+            target[start_col:start_col + len(row)] = row
+
+    def _clear(self, range_name: str):
+        title, grid = self._split_range(range_name)
+        if grid is None or not grid:
+            self.values[title] = []
+            return
+        grid_values = self.values.get(title, [])
+        for r in range(grid.get("startRowIndex", 0), min(grid.get("endRowIndex", len(grid_values)), len(grid_values))):
+            row = grid_values[r]
+            for c in range(grid.get("startColumnIndex", 0), min(grid.get("endColumnIndex", len(row)), len(row))):
+                row[c] = ""
+
+    def _read(self, range_name: str, params: Optional[dict] = None) -> dict:
+        title, _ = self._split_range(range_name)
+        unformatted = (params or {}).get("valueRenderOption") == "UNFORMATTED_VALUE"
+        rows = [[_rendered(v, unformatted) for v in row] for row in self.values.get(title, [])]
+        # The API trims trailing empty cells and rows
+        rows = [row[:max([i + 1 for i, v in enumerate(row) if v != ""] or [0])] for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return {"range": range_name, "majorDimension": "ROWS", "values": rows}
+
+    def _metadata(self) -> dict:
+        return {
+            "spreadsheetId": BENCH_SPREADSHEET_ID,
+            "properties": {"title": "Benchmark", "locale": "en_US", "timeZone": "America/Chicago"},
+            "sheets": [
+                {"properties": props, "developerMetadata": self.developer_metadata.get(props["sheetId"], [])}
+                for props in self.sheets.values()
+            ],
+        }
+
+    def _batch_update(self, body: dict) -> dict:
+        replies = []
+        for request in body.get("requests", []):
+            if "addSheet" in request:
+                props = request["addSheet"].get("properties", {})
+                grid = props.get("gridProperties", {})
+                added = self._add_sheet(props["title"], grid.get("rowCount", 1000), grid.get("columnCount", 26))
+                replies.append({"addSheet": {"properties": added}})
+            elif "createDeveloperMetadata" in request:
+                entry = request["createDeveloperMetadata"]["developerMetadata"]
+                self.developer_metadata.setdefault(entry["location"]["sheetId"], []).append(entry)
+                replies.append({"createDeveloperMetadata": {"developerMetadata": entry}})
+            elif "deleteDeveloperMetadata" in request:
+                lookup = request["deleteDeveloperMetadata"]["dataFilter"]["developerMetadataLookup"]
+                sheet_id = lookup["metadataLocation"]["sheetId"]
+                self.developer_metadata[sheet_id] = [
+                    e for e in self.developer_metadata.get(sheet_id, []) if e["metadataKey"] != lookup["metadataKey"]
+                ]
+                replies.append({})
+            elif "updateSheetProperties" in request:
+                props = request["updateSheetProperties"]["properties"]
+                for sheet in self.sheets.values():
+                    if sheet["sheetId"] == props.get("sheetId"):
+                        sheet["gridProperties"].update(props.get("gridProperties", {}))
+                replies.append({})
+            elif "updateCells" in request:
+                # Only the whole-tab clear the handler sends (no rows, fields=userEnteredValue)
+                self.values[self._title(request["updateCells"]["range"]["sheetId"])] = []
+                replies.append({})
+            elif "copyPaste" in request:
+                source, destination = request["copyPaste"]["source"], request["copyPaste"]["destination"]
+                rows = self.values.get(self._title(source["sheetId"]), [])
+                block = [
+                    row[source["startColumnIndex"]:source["endColumnIndex"]]
+                    for row in rows[source["startRowIndex"]:source["endRowIndex"]]
+                ]
+                start = rowcol_to_a1(destination["startRowIndex"] + 1, destination["startColumnIndex"] + 1)
+                self._write(f"'{self._title(destination['sheetId'])}'!{start}", block, raw=True)
+                replies.append({})
+            else:
+                replies.append({})
+        return {"spreadsheetId": BENCH_SPREADSHEET_ID, "replies": replies}
+
+    # ---------------------------------------------------------------
+    # HTTPClient
+    # ---------------------------------------------------------------
+    def request(self, method, endpoint, params=None, data=None, json=None, files=None, headers=None):
+        # `json` is the request body here (gspread passes it by that keyword)
+        body_size = len(dumps(json).encode("utf-8")) if json is not None else 0
+        path = endpoint[len(SPREADSHEETS_API_V4_BASE_URL) + 1:] if endpoint.startswith(SPREADSHEETS_API_V4_BASE_URL) else endpoint
+        _, _, rest = path.partition(BENCH_SPREADSHEET_ID)
+
+        if rest == "":
+            kind, payload = "metadata", self._metadata()
+        elif rest == ":batchUpdate":
+            kind, payload = "batch_update", self._batch_update(json)
+        elif rest == "/values:batchUpdate":
+            kind = "values_batch_update"
+            raw = json.get("valueInputOption") == "RAW"
+            for item in json.get("data", []):
+                self._write(item["range"], item["values"], raw)
+            payload = {"spreadsheetId": BENCH_SPREADSHEET_ID}
+        elif rest == "/values:batchClear":
+            kind = "values_batch_clear"
+            for range_name in json.get("ranges", []):
+                self._clear(range_name)
+            payload = {"spreadsheetId": BENCH_SPREADSHEET_ID}
+        elif rest == "/values:batchGet":
+            kind = "values_batch_get"
+            ranges = (params or {}).get("ranges", [])
+            ranges = [ranges] if isinstance(ranges, str) else ranges
+            payload = {"spreadsheetId": BENCH_SPREADSHEET_ID, "valueRanges": [self._read(r, params) for r in ranges]}
+        elif rest.startswith("/values/"):
+            range_part = rest[len("/values/"):]
+            if range_part.endswith(":clear"):
+                kind = "values_clear"
+                self._clear(unquote(range_part[:-len(":clear")]))
+                payload = {}
+            elif range_part.endswith(":append"):
+                kind = "values_append"
+                title, _ = self._split_range(unquote(range_part[:-len(":append")]))
+                start = len(self._read(title)["values"])
+                raw = (params or {}).get("valueInputOption") == "RAW"
+                self._write(f"'{title}'!A{start + 1}", json.get("values", []), raw)
+                payload = {"updates": {"updatedRows": len(json.get("values", []))}}
+            elif method.lower() == "put":
+                kind = "values_update"
+                raw = (params or {}).get("valueInputOption") == "RAW"
+                self._write(unquote(range_part), json.get("values", []), raw)
+                payload = {"spreadsheetId": BENCH_SPREADSHEET_ID}
+            else:
+                kind, payload = "values_get", self._read(unquote(range_part), params)
+        else:
+            raise NotImplementedError(f"{method.upper()} {endpoint}")
+
+        self.calls.append((method.upper(), kind, body_size))
+        return _response(payload)
+
+
+class BenchSheetsHandler(SheetsHandler):
+    """SheetsHandler wired to an in-memory FakeSheetsHTTPClient instead of Google."""
+
+    def _authenticate(self):
+        self.client = gspread.Client(None, http_client=FakeSheetsHTTPClient)
+
+    @property
+    def http(self) -> FakeSheetsHTTPClient:
+        return self.client.http_client
@@ -0,0 +1,81 @@
+# benchmarks/import_budget.py
+"""
+Checks the cold-start cost of the entry points with `python -X importtime`.
+
+Each module is imported in a fresh interpreter; the check fails if its
+cumulative import time exceeds the budget, or if it pulls in a heavy
+dependency that should only load once a run actually needs it.
+
+Run from the project root:
+    uv run python -m benchmarks.import_budget
+    uv run python -m benchmarks.import_budget --budget-ms 150 --top 10
+"""
+import argparse
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+ENTRY_MODULES = ["src.main", "src.main_midday", "src.main_midafternoon", "src.runner"]
+
+# Loaded lazily by the pipeline; an entry point importing any of these is a regression
+HEAVY_MODULES = ["pandas", "numpy", "pyarrow", "gspread", "gspread_dataframe", "google.oauth2", "pyodbc"]
+
+DEFAULT_BUDGET_MS = 150
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_profile(module: str) -> List[Tuple[int, int, int, str]]:
+    """(self µs, cumulative µs, nesting depth, module) for every import made."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("modules", nargs="*", default=ENTRY_MODULES)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=5, help="Slowest imports to list per module")
+    args = parser.parse_args()
+
+    failures = []
+    for module in args.modules:
+        rows = import_profile(module)
+        total_ms = next((cum for _, cum, _, name in rows if name == module), 0) / 1000
+        loaded = {name for _, _, _, name in rows}
+        heavy = [m for m in HEAVY_MODULES if m in loaded]
+
+        status = "OK" if total_ms <= args.budget_ms and not heavy else "FAIL"
+        print(f"{status:<4} {module:<24} {total_ms:8.1f} ms (budget {args.budget_ms:.0f} ms)")
+        for self_us, _, _, name in sorted(rows, reverse=True)[:args.top]:
+            print(f"        {self_us / 1000:7.1f} ms  {name}")
+
+        if total_ms > args.budget_ms:
+            failures.append(f"{module}: {total_ms:.1f} ms > {args.budget_ms:.0f} ms")
+        if heavy:
+            failures.append(f"{module}: imports {', '.join(heavy)} at startup")
+
+    if failures:
+        print("\nImport budget exceeded:")
+        for failure in failures:
+            print(f"   {failure}")
+        sys.exit(1)
+    print("\nAll entry points within the import budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# benchmarks/synthetic.py
+import random
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+# Same columns/types pyodbc reports for sql_query/task_by_tech_eff.sql
+# (name, type_code, display_size, internal_size, precision, scale, null_ok)
+TASK_DESCRIPTION = [
+    ("CompletedBy", int, None, 10, 10, 0, False),
+    ("CaseNumber", str, None, 20, 20, 0, True),
+    ("CompleteDate", datetime, None, 23, 23, 3, True),
+    ("Duration", Decimal, None, 9, 9, 2, True),
+]
+
+# The query before names moved to employees.sql: dbo.employees joined per row
+JOINED_TASK_DESCRIPTION = TASK_DESCRIPTION[:1] + [("Name", str, None, 101, 101, 0, True)] + TASK_DESCRIPTION[1:]
+
+# sql_query/employees.sql
+EMPLOYEE_DESCRIPTION = [
+    ("EmployeeID", int, None, 10, 10, 0, False),
+    ("Name", str, None, 101, 101, 0, True),
+]
+
+FIRST_TECH = 1000
+
+
+def tech_name(tech: int) -> str:
+    return f"Tech{tech} Surname{tech}"
+
+
+def make_employee_rows(n_techs: int = 60) -> List[Tuple]:
+    """dbo.employees rows for every technician make_task_rows can produce."""
+    return [(tech, tech_name(tech)) for tech in range(FIRST_TECH, FIRST_TECH + n_techs)]
+
+
+def make_task_rows(
+    n_rows: int,
+    days: int = 5,
+    n_techs: int = 60,
+    n_cases: Optional[int] = None,
+    end: Optional[datetime] = None,
+    seed: int = 42,
+    joined: bool = False,
+) -> List[Tuple]:
+    """
+    Generates CaseTasksHistory-shaped rows (as pyodbc would return them) spread
+    over the `days` days before `end`, sorted by CompleteDate. `joined` adds
+    the Name column the query used to return (JOINED_TASK_DESCRIPTION).
+    """
+    rnd = random.Random(seed)
+    if end is None:
+        end = datetime.now().replace(microsecond=0)
+    if n_cases is None:
+        n_cases = max(n_rows // 8, 1)
+
+    span_seconds = days * 86400
+    durations = [Decimal(d) for d in ("2.00", "5.00", "7.50", "10.00", "15.00", "30.00")]
+
+    rows = []
+    for _ in range(n_rows):
+        tech = rnd.randrange(FIRST_TECH, FIRST_TECH + n_techs)
+        rows.append((
+            tech,
+            str(140000 + rnd.randrange(n_cases)),
+            end - timedelta(seconds=rnd.randrange(span_seconds), milliseconds=rnd.randrange(1000)),
+            rnd.choice(durations),
+        ))
+
+    rows.sort(key=lambda row: row[2])
+    if joined:
+        rows = [(row[0], tech_name(row[0])) + row[1:] for row in rows]
+    return rows
@@ -0,0 +1,8 @@
+@echo off
+REM Change to the script's directory (project root)
+cd /d "C:\Users\MagicTouch\Desktop\Nick\repos\daily_eff_oldway"
+
+REM Run the report scheduler (daily, 12 PM and 3 PM runs) in one long-lived process
+powershell.exe -Command "uv run python -m src.scheduler"
+
+pause
\ No newline at end of file
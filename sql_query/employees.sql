@@ -0,0 +1,5 @@
+SELECT
+    em.EmployeeID,
+    CONCAT(em.FirstName, ' ', em.LastName) AS [Name]
+FROM
+    dbo.employees AS em;
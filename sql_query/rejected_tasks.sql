@@ -0,0 +1,28 @@
+-- tab: REJECTED_TASKS
+-- window: daily
+SELECT
+    cth.CompletedBy,
+    CONCAT(EM.FirstName, ' ', EM.LastName) AS [Name],
+    ca.CaseNumber,
+    cth.Task,
+    cth.CompleteDate,
+    ct.Duration
+FROM
+    dbo.CaseTasksHistory AS cth
+INNER JOIN
+    dbo.employees AS em
+    ON em.EmployeeID = cth.CompletedBy
+INNER JOIN
+    dbo.CaseTasks AS ct
+    ON ct.CaseID = cth.CaseID
+    AND ct.Task = cth.Task
+    AND ct.CaseProductID = cth.CaseProductID
+INNER JOIN
+    dbo.Cases AS ca
+    ON ca.CaseID = cth.CaseID
+WHERE
+    cth.CompleteDate >= :start -- window start (inclusive)
+    AND cth.CompleteDate < :end -- window end (exclusive)
+    AND cth.Rejected = 1
+ORDER BY
+    cth.Task ASC;
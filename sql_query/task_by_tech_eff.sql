@@ -1,14 +1,11 @@
+-- Technician names come from employees.sql, fetched once and mapped client-side
 SELECT
     cth.CompletedBy,
-    CONCAT(EM.FirstName, ' ', EM.LastName) AS [Name],
     ca.CaseNumber,
     cth.CompleteDate,
     ct.Duration
 FROM
     dbo.CaseTasksHistory AS cth
-INNER JOIN
-    dbo.employees AS em
-    ON em.EmployeeID = cth.CompletedBy -- This join condition is now correct
 INNER JOIN
     dbo.CaseTasks AS ct
     ON ct.CaseID = cth.CaseID
@@ -18,7 +15,8 @@ INNER JOIN
     dbo.Cases AS ca
     ON ca.CaseID = cth.CaseID
 WHERE
-    cth.CompleteDate >= DATEADD(day, -5, GETDATE())
+    cth.CompleteDate >= :start -- window start (inclusive)
+    AND cth.CompleteDate < :end -- window end (exclusive)
     AND cth.Rejected = 0
 --AND ca.CaseNumber = '145523'
 ORDER BY
@@ -0,0 +1,88 @@
+# src/aggregations.py
+from typing import List, Optional
+
+import pandas as pd
+
+from .reports import Window
+
+DATE_COL = 'CompleteDate'
+TECH_KEYS = ['CompletedBy', 'Name']
+MEASURES = ['Tasks', 'TotalDuration', 'DistinctCases']
+
+# Server-side rollup for summary_from_rollup: a total row per technician
+# (distinct cases can't be summed over hours) plus one row per technician and hour
+SUMMARY_GROUPING_SETS = [("technician",), ("technician", "hour")]
+
+
+def hour_label(hour: int) -> str:
+    """0 → '12 AM', 3 → '3 AM', 15 → '3 PM'."""
+    return f"{hour % 12 or 12} {'AM' if hour < 12 else 'PM'}"
+
+
+def window_hours(window: Window) -> List[int]:
+    """Clock hours whose bucket starts inside the [start, end) window."""
+    start_time, end_time = window
+    hours = pd.date_range(start_time, end_time, freq="h", inclusive="left").hour
+    return list(dict.fromkeys(hours))
+
+
+def summarize_by_technician(df: pd.DataFrame, window: Optional[Window] = None) -> pd.DataFrame:
+    """
+    One row per technician: task count, total Duration, distinct cases and,
+    when a window is given, Duration per clock hour of that window.
+
+    Everything is a single groupby on the (categorical) technician keys;
+    there are no per-row or per-technician Python loops.
+    """
+    keys = [k for k in TECH_KEYS if k in df.columns]
+    grouped = df.groupby(keys, observed=True, sort=True)
+
+    summary = grouped.agg(
+        Tasks=('Duration', 'size'),
+        TotalDuration=('Duration', 'sum'),
+        DistinctCases=('CaseNumber', 'nunique'),
+    )
+
+    hourly = None
+    if window is not None:
+        hourly = (
+            df.groupby(keys + [df[DATE_COL].dt.hour.rename('Hour')], observed=True, sort=True)['Duration']
+            .sum()
+            .unstack('Hour', fill_value=0)
+        )
+    return _finish_summary(summary, hourly, window)
+
+
+def summary_from_rollup(rollup: pd.DataFrame, window: Optional[Window] = None) -> pd.DataFrame:
+    """
+    summarize_by_technician's table from the server-side SUMMARY_GROUPING_SETS
+    rollup (technician names attached): rows with a NULL Hour are the
+    per-technician totals, the rest are Duration per technician and hour.
+    """
+    keys = [k for k in TECH_KEYS if k in rollup.columns]
+    per_hour = rollup['Hour'].notna().to_numpy()
+
+    summary = rollup[~per_hour].set_index(keys)[MEASURES].sort_index()
+
+    hourly = None
+    if window is not None:
+        hourly_rows = rollup[per_hour]
+        hourly = (
+            hourly_rows.set_index(keys + [hourly_rows['Hour'].astype('int64')])['TotalDuration']
+            .unstack('Hour', fill_value=0)
+        )
+    return _finish_summary(summary, hourly, window)
+
+
+def _finish_summary(summary: pd.DataFrame, hourly: Optional[pd.DataFrame], window: Optional[Window]) -> pd.DataFrame:
+    """Joins the per-hour Duration columns, fixes the count dtypes and sorts by TotalDuration."""
+    if hourly is not None:
+        hours = window_hours(window)
+        # Same columns every run, even for hours with no completions yet
+        hourly = hourly.reindex(columns=hours, fill_value=0)
+        hourly.columns = [hour_label(h) for h in hours]
+        summary = summary.join(hourly, how='left')
+
+    summary = summary.reset_index()
+    summary[['Tasks', 'DistinctCases']] = summary[['Tasks', 'DistinctCases']].astype('int64')
+    return summary.sort_values('TotalDuration', ascending=False, kind='stable', ignore_index=True)
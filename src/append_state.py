@@ -0,0 +1,133 @@
+# src/append_state.py
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Collection, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_env
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_APPEND_STATE_PATH = BASE_DIR.parent / ".cache" / "append_state.json"
+
+DATE_COL = 'CompleteDate'
+
+# Rewrite an append-mode tab in full after this many appends in a row, so
+# edits to rows that were already uploaded are never missed for long
+RECONCILE_EVERY = 6
+
+
+class AppendState:
+    """
+    What each append-mode tab holds: its window start, row count and newest
+    CompleteDate after the last upload, kept in .cache/append_state.json.
+
+    Each intraday tab is written once per business day, so a tab's own entry
+    is always from an earlier window by its next run. A tab can instead be
+    seeded from another tab holding part of the same window (seed_for): the
+    3PM tab starts from the rows the 12PM run uploaded (both windows start at
+    3 AM) and only appends what was completed after the 12PM high-water mark.
+    """
+
+    def __init__(self, path: Path = DEFAULT_APPEND_STATE_PATH):
+        self.path = Path(path)
+        # Entries are per spreadsheet, like TabFingerprints
+        self.spreadsheet_id = get_env("GOOGLE_SPREADSHEET_ID") or ""
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _key(self, sheet_name: str) -> str:
+        return f"{self.spreadsheet_id}/{sheet_name}"
+
+    def get(self, sheet_name: str) -> Optional[dict]:
+        return self._read().get(self._key(sheet_name))
+
+    def seed_for(
+        self,
+        sheet_name: str,
+        window_start: datetime,
+        columns: Collection,
+        exclude: Collection[str] = (),
+    ) -> Optional[Tuple[str, dict]]:
+        """
+        (tab, entry) of the fullest other tab of this spreadsheet whose last
+        upload covers the same window start with the same columns, or None.
+        Tabs in `exclude` (written by the current run) are never used.
+        """
+        prefix = f"{self.spreadsheet_id}/"
+        start = window_start.isoformat()
+        columns = [str(c) for c in columns]
+        best = None
+        for key, entry in self._read().items():
+            tab = key[len(prefix):]
+            if not key.startswith(prefix) or tab == sheet_name or tab in exclude:
+                continue
+            if entry.get("window_start") != start or entry.get("columns") != columns:
+                continue
+            if best is None or entry.get("rows", 0) > best[1].get("rows", 0):
+                best = (tab, entry)
+        return best
+
+    def record(
+        self,
+        sheet_name: str,
+        window_start: datetime,
+        df: pd.DataFrame,
+        appended: Optional[pd.DataFrame] = None,
+        seed: Optional[dict] = None,
+    ):
+        """
+        Stores the tab's state after an upload of `df` (the whole window).
+        `appended` is the part that was appended; None means a full rewrite.
+        `seed` is the entry of the tab it was seeded from, if any.
+        """
+        state = self._read()
+        previous = seed if seed is not None else state.get(self._key(sheet_name)) or {}
+        latest = df[DATE_COL].max() if len(df) else None
+
+        state[self._key(sheet_name)] = {
+            "window_start": window_start.isoformat(),
+            "columns": [str(c) for c in df.columns],
+            "rows": len(df),
+            "last_complete_date": latest.isoformat() if latest is not None else None,
+            "appends": previous.get("appends", 0) + 1 if appended is not None else 0,
+            "uploaded_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def rows_to_append(entry: Optional[dict], df: pd.DataFrame, window_start: datetime) -> Optional[pd.DataFrame]:
+    """
+    Rows of `df` completed since the tab's last upload, or None when the tab
+    must be rewritten in full instead: no state yet, a new window (the next
+    day), different columns, RECONCILE_EVERY appends reached, or rows at or
+    before the last uploaded CompleteDate that were added or removed since.
+    """
+    if not entry or entry.get("window_start") != window_start.isoformat():
+        return None
+    if entry.get("columns") != [str(c) for c in df.columns]:
+        return None
+    if entry.get("appends", 0) >= RECONCILE_EVERY:
+        return None
+
+    last = entry.get("last_complete_date")
+    if last is None:
+        return df if entry.get("rows", 0) == 0 else None
+
+    seen = (df[DATE_COL] <= pd.Timestamp(last)).to_numpy()
+    if int(seen.sum()) != entry.get("rows"):
+        return None
+    return df[~seen]
@@ -0,0 +1,212 @@
+# src/backfill.py
+"""
+Rebuilds the daily efficiency report for a range of past business days.
+
+The whole range is fetched with one windowed query (streamed in chunks),
+each chunk is split into per-day frames with a single groupby, and the
+days are written by a small pool of Sheets writers, so a month takes one
+query plus a few batched uploads instead of one 5-day query per day.
+
+Each business day goes to its own tab ("<daily tab> 2025-10-14" by
+default), or with --append every day is written, in order, to one tab.
+
+Run from the project root:
+    uv run python -m src.backfill 2025-10-01 2025-10-31
+    uv run python -m src.backfill 2025-10-01 2025-10-31 --append "October backfill"
+    uv run python -m src.backfill 2025-10-06 2025-10-10 --tab-format "EFF {day:%m-%d}" --workers 2
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, time, timedelta
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence
+
+from .holidays import get_business_calendar
+from .metrics import count, finish_run, span, start_run
+from .reports import REPORTS
+from .runner import DATE_COL, SHEETS_WORKERS, SQL_FILE_PATH, finish_report, open_sheets, prepare_rows
+from .sql_templates import window_params
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .sheets_handler import SheetsHandler
+
+DEFAULT_TAB_FORMAT = "{sheet_name} {day:%Y-%m-%d}"
+
+# Days per values batch update: fewer, larger requests against the per-minute quota
+DAYS_PER_BATCH = 5
+
+
+def backfill_days(first: date, last: date) -> List[date]:
+    """Business days from first to last, both inclusive."""
+    return get_business_calendar().business_days(first, last + timedelta(days=1))
+
+
+@span("backfill.split")
+def split_days(chunk: pd.DataFrame, days: Sequence[date]) -> Dict[date, pd.DataFrame]:
+    """One groupby over the chunk's calendar days; rows outside `days` are dropped."""
+    wanted = set(days)
+    return {
+        day.date(): frame
+        for day, frame in chunk.groupby(chunk[DATE_COL].dt.normalize(), sort=False)
+        if day.date() in wanted
+    }
+
+
+def fetch_days(days: Sequence[date], refresh: bool = False) -> Optional[Dict[date, pd.DataFrame]]:
+    """Rows for every day in `days` from one query over [first day, last day + 1); None on failure."""
+    from .db_handler import concat_frames, get_result_cache, iter_sql_dataframes
+
+    start_time = datetime.combine(days[0], time(0, 0))
+    end_time = datetime.combine(days[-1], time(0, 0)) + timedelta(days=1)
+    print(f"\nStep 1: Fetching {start_time:%Y-%m-%d} – {end_time:%Y-%m-%d} in one query from: {SQL_FILE_PATH}")
+
+    day_parts: Dict[date, List[pd.DataFrame]] = {day: [] for day in days}
+    empty = None
+    try:
+        for chunk in iter_sql_dataframes(
+            str(SQL_FILE_PATH),
+            params=window_params(start_time, end_time),
+            transform=prepare_rows,
+            cache=get_result_cache(),
+            refresh=refresh,
+        ):
+            empty = chunk.head(0)
+            for day, frame in split_days(chunk, days).items():
+                day_parts[day].append(frame)
+    except Exception as e:
+        print(f"ERROR loading data: {e}")
+        return None
+
+    if empty is None:
+        print("No data returned.")
+        return None
+
+    daily = REPORTS["daily"]
+    # Days without rows still get a header-only tab
+    return {day: finish_report(daily, concat_frames(parts) if parts else empty) for day, parts in day_parts.items()}
+
+
+def run_backfill(
+    first: date,
+    last: date,
+    tab_format: str = DEFAULT_TAB_FORMAT,
+    append_to: Optional[str] = None,
+    workers: int = SHEETS_WORKERS,
+    refresh: bool = False,
+) -> bool:
+    """
+    Rebuilds the daily report for every business day from first to last.
+
+    Returns:
+        bool: True if every day was uploaded, False otherwise
+    """
+    days = backfill_days(first, last)
+    if not days:
+        print(f"No business days between {first} and {last}.")
+        return False
+
+    start_run(reports="backfill", first=first.isoformat(), last=last.isoformat(), days=len(days))
+    print(f"Backfill of {len(days)} business days ({days[0]} – {days[-1]}) started at {datetime.now():%H:%M:%S}")
+
+    success = False
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sheets") as pool:
+            # Authenticate while the range query runs
+            sheets_future: Future = pool.submit(open_sheets)
+            frames = fetch_days(days, refresh=refresh)
+            if frames is not None:
+                success = _upload_days(pool, sheets_future, frames, tab_format, append_to)
+    finally:
+        finish_run(success)
+
+    print(f"\nBackfill finished at {datetime.now():%H:%M:%S}\n")
+    return success
+
+
+def _upload_days(
+    pool: ThreadPoolExecutor,
+    sheets_future: Future,
+    frames: Dict[date, pd.DataFrame],
+    tab_format: str,
+    append_to: Optional[str],
+) -> bool:
+    """Submits the day tabs in batches of DAYS_PER_BATCH and waits for them."""
+    from .db_handler import concat_frames
+
+    for day, frame in frames.items():
+        print(f"   → {day:%a %Y-%m-%d}: {len(frame):,} rows")
+        count("rows.backfill", len(frame))
+
+    if append_to:
+        tabs = [{append_to: concat_frames(list(frames.values()))}]
+    else:
+        sheet_name = REPORTS["daily"].sheet_name
+        named = {tab_format.format(sheet_name=sheet_name, day=day): frame for day, frame in frames.items()}
+        names = list(named)
+        tabs = [
+            {name: named[name] for name in names[i:i + DAYS_PER_BATCH]}
+            for i in range(0, len(names), DAYS_PER_BATCH)
+        ]
+
+    print(f"\nStep 2: Uploading {sum(len(batch) for batch in tabs)} tab(s) in {len(tabs)} batch(es)...")
+    try:
+        with span("sheets.wait_ready"):
+            sheets: SheetsHandler = sheets_future.result()
+    except Exception as e:
+        print(f"ERROR during upload: {e}")
+        return False
+
+    uploads = [(batch, pool.submit(sheets.write_dataframes_to_sheets, batch)) for batch in tabs]
+
+    success = True
+    for batch, upload in uploads:
+        with span("upload.wait"):
+            uploaded = upload.result()
+        for name, frame in batch.items():
+            if uploaded:
+                print(f"SUCCESS: Uploaded {len(frame):,} rows to '{name}'")
+            else:
+                print(f"Upload failed for '{name}' (SheetsHandler returned False)")
+        success = success and uploaded
+    return success
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point: `python -m src.backfill FIRST LAST`."""
+    parser = argparse.ArgumentParser(description="Rebuild the daily efficiency report for past business days.")
+    parser.add_argument("first", type=date.fromisoformat, help="First day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("last", type=date.fromisoformat, help="Last day to rebuild, inclusive (YYYY-MM-DD)")
+    parser.add_argument(
+        "--tab-format",
+        default=DEFAULT_TAB_FORMAT,
+        help="Tab name per day; {sheet_name} is the daily tab, {day} the date (default: %(default)r)",
+    )
+    parser.add_argument("--append", metavar="TAB", help="Write every day, in order, to this one tab instead")
+    parser.add_argument("--workers", type=int, default=SHEETS_WORKERS, help="Concurrent Sheets writers")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the local query result cache and fetch fresh rows",
+    )
+    args = parser.parse_args(argv)
+
+    if args.last < args.first:
+        parser.error("last must not be before first")
+    if args.last >= date.today():
+        parser.error("backfill only rebuilds days that are already over (last must be before today)")
+
+    run_backfill(
+        args.first,
+        args.last,
+        tab_format=args.tab_format,
+        append_to=args.append,
+        workers=max(args.workers, 1),
+        refresh=args.refresh,
+    )
+
+
+if __name__ == "__main__":
+    main()
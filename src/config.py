@@ -0,0 +1,53 @@
+# src/config.py
+import json
+import os
+import threading
+from functools import lru_cache
+from typing import Optional
+
+_ENV_LOADED = False
+_ENV_LOCK = threading.Lock()
+
+
+def load_environment():
+    """Loads the project's .env file into os.environ, once per process."""
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return
+    with _ENV_LOCK:
+        if not _ENV_LOADED:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _ENV_LOADED = True
+
+
+def get_env(name: str, default: Optional[str] = None) -> Optional[str]:
+    """os.getenv after making sure .env has been loaded."""
+    load_environment()
+    return os.getenv(name, default)
+
+
+@lru_cache(maxsize=None)
+def sql_server_credentials() -> dict:
+    """SQL Server credentials from the environment, read once per process."""
+    return {
+        "SERVER": get_env("SQL_SERVER"),
+        "DATABASE": get_env("SQL_DATABASE"),
+        "USERNAME": get_env("SQL_USERNAME"),
+        "PASSWORD": get_env("SQL_PASSWORD"),
+    }
+
+
+@lru_cache(maxsize=None)
+def google_service_account_info() -> dict:
+    """Parsed GOOGLE_SERVICE_ACCOUNT_JSON, decoded once per process."""
+    credentials_json_string = get_env("GOOGLE_SERVICE_ACCOUNT_JSON")
+
+    if not credentials_json_string:
+        raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON not found in environment variables.")
+
+    try:
+        return json.loads(credentials_json_string)
+    except json.JSONDecodeError:
+        raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON is not a valid JSON string. Check formatting.")
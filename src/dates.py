@@ -0,0 +1,90 @@
+# src/dates.py
+"""
+CompleteDate normalization and window slicing shared by the runner and the task store.
+
+Dates are parsed once, to datetime64, and every later step (window
+filtering, day partitioning, the daily tab's plain dates) works on that
+column directly instead of on per-row Python date objects.
+"""
+from datetime import datetime
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+DATE_COL = 'CompleteDate'
+
+# SQL Server datetimes arrive as datetime64 from the driver; text values
+# (older cache files, CSV exports) are ISO 8601
+DATE_FORMAT = "ISO8601"
+
+Window = Tuple[datetime, datetime]
+
+
+def normalize_dates(df: pd.DataFrame, column: str = DATE_COL) -> pd.DataFrame:
+    """
+    Makes `column` datetime64 in a single pass and drops rows that fail to parse.
+
+    A column that is already datetime64 (the usual case) is left as is;
+    anything else is parsed with the known ISO format rather than per-row
+    format inference.
+    """
+    if column not in df.columns:
+        raise KeyError(f"Column '{column}' not found! Available columns: {list(df.columns)}")
+
+    if not pd.api.types.is_datetime64_dtype(df[column]):
+        df[column] = pd.to_datetime(df[column], format=DATE_FORMAT, errors='coerce')
+
+    bad_dates = df[column].isna()
+    if bad_dates.any():
+        print(f"   Dropped {bad_dates.sum()} rows with invalid {column.lower()}")
+        df = df[~bad_dates]
+    return df
+
+
+def _is_sorted(dates: np.ndarray) -> bool:
+    return len(dates) < 2 or bool((dates[1:] >= dates[:-1]).all())
+
+
+def _slice(df: pd.DataFrame, dates: np.ndarray, window: Window, presorted: bool) -> pd.DataFrame:
+    start, end = np.datetime64(window[0]), np.datetime64(window[1])
+
+    if presorted:
+        lo, hi = dates.searchsorted([start, end])
+        return df if (lo, hi) == (0, len(df)) else df.iloc[lo:hi]
+
+    mask = (dates >= start) & (dates < end)
+    return df if mask.all() else df[mask]
+
+
+def split_windows(df: pd.DataFrame, windows: Dict[str, Window], column: str = DATE_COL) -> Dict[str, pd.DataFrame]:
+    """
+    Rows of `df` in each [start, end) window, keyed like `windows`.
+
+    Sorted input (the task store's day partitions) is cut with searchsorted
+    into positional slices that share df's data. Otherwise each window is one
+    datetime64 comparison; sorting first would cost more than it saves. A
+    window covering every row returns df itself, so callers must not modify
+    the frames in place.
+    """
+    dates = df[column].to_numpy()
+    presorted = _is_sorted(dates)
+    return {name: _slice(df, dates, window, presorted) for name, window in windows.items()}
+
+
+def window_slice(df: pd.DataFrame, window: Window, column: str = DATE_COL) -> pd.DataFrame:
+    """Rows of `df` in one [start, end) window (see split_windows)."""
+    return split_windows(df, {"window": window}, column)["window"]
+
+
+def plain_dates(values: pd.Series) -> pd.Series:
+    """
+    The same column as `values.dt.date` (datetime.date objects), built from
+    the distinct days only.
+
+    A report window spans a handful of days, so this creates a few date
+    objects and fans them out with one take, instead of one per row.
+    """
+    codes, days = pd.factorize(values.dt.normalize())
+    day_objects = np.asarray([day.date() for day in days], dtype=object)
+    return pd.Series(day_objects[codes], index=values.index, name=values.name, dtype=object)
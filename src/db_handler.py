@@ -1,22 +1,38 @@
 # src/db_handler.py
-import os
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Sequence
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pyodbc  # <--- NEW: Library for SQL Server
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Connection settings and the shared pool live in db_pool (no pandas needed there)
+from .db_pool import (
+    ConnectionPool,
+    get_connection_string,
+    get_pool,
+    get_sql_server_credentials,
+    is_disconnect_error,
+)
+from .metrics import count, span
+from .result_cache import ResultCache, ResultWriter, cache_key, default_cache
+from .sql_templates import Params, bind
 
+# Rows fetched per round trip / DataFrame chunk when streaming results
+DEFAULT_CHUNK_SIZE = 50_000
 
-def get_sql_server_credentials() -> dict:
-    """Fetches SQL Server credentials from environment variables."""
-    # Fetch all the necessary credentials defined in your .env
-    return {
-        "SERVER": os.getenv("SQL_SERVER"),
-        "DATABASE": os.getenv("SQL_DATABASE"),
-        "USERNAME": os.getenv("SQL_USERNAME"),
-        "PASSWORD": os.getenv("SQL_PASSWORD"),
-    }
+# Target dtypes for the task_by_tech_eff.sql columns. Anything not listed
+# here is typed from the pyodbc cursor description instead. The repeated
+# keys are categoricals: each distinct value is stored once, rows hold codes.
+TASK_COLUMN_DTYPES: Dict[str, str] = {
+    "CompletedBy": "category",
+    "Name": "category",
+    "CaseNumber": "category",
+    "CompleteDate": "datetime64[ns]",
+    "Duration": "float64",
+}
 
 
 def read_sql_query(file_path: str) -> str:
@@ -29,53 +45,334 @@ def read_sql_query(file_path: str) -> str:
         return ""
 
 
-def execute_sql_to_dataframe(sql_query_file: str) -> pd.DataFrame:
+_RESULT_CACHE: Optional[ResultCache] = None
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide query result cache under .cache/query_results (created on first use)."""
+    global _RESULT_CACHE
+    with _RESULT_CACHE_LOCK:
+        if _RESULT_CACHE is None:
+            _RESULT_CACHE = default_cache()
+        return _RESULT_CACHE
+
+
+def _column_dtype(type_code) -> Optional[str]:
+    """Maps a pyodbc cursor.description type code (a Python type) to a NumPy dtype."""
+    if type_code in (datetime, date):
+        return "datetime64[ns]"
+    if type_code in (float, Decimal):
+        return "float64"
+    if type_code is int:
+        return "int64"
+    if type_code is bool:
+        return "bool"
+    return None
+
+
+def _build_column(values: Sequence, dtype: Optional[str], type_code=None):
+    """Builds one typed column straight from a tuple of Python values."""
+    if dtype == "category":
+        if type_code is int:
+            # Integer keys factorize much faster from a native int array
+            try:
+                return pd.Categorical(np.array(values, dtype="int64"))
+            except (TypeError, ValueError):
+                pass
+        return pd.Categorical(values)
+    if dtype is None:
+        return np.array(values, dtype=object)
+    if dtype.startswith("datetime64"):
+        # pandas converts datetime objects in C; np.array(..., 'datetime64') is ~5x slower
+        return pd.array(values, dtype=dtype)
+
+    try:
+        return np.array(values, dtype=dtype)
+    except (TypeError, ValueError):
+        # NULLs in an int/bool column: fall back to float (NaN) or object
+        if dtype in ("int64", "bool"):
+            try:
+                return np.array(values, dtype="float64")
+            except (TypeError, ValueError):
+                pass
+        return np.array(values, dtype=object)
+
+
+@span("db.materialize")
+def rows_to_dataframe(
+    rows: Sequence[Sequence],
+    description: Sequence,
+    dtypes: Optional[Dict[str, str]] = None,
+) -> pd.DataFrame:
+    """
+    Materializes fetched pyodbc rows as typed columns in one pass.
+
+    The rows are transposed once into per-column tuples and each column is
+    converted directly to its dtype (datetime64, float64, categorical, ...),
+    instead of going through pd.read_sql's row-wise object frame and a later
+    pd.to_datetime re-parse.
+    """
+    if dtypes is None:
+        dtypes = TASK_COLUMN_DTYPES
+
+    columns: List[str] = [col[0] for col in description]
+    values_by_column = list(zip(*rows)) if rows else [()] * len(columns)
+
+    data = {}
+    for name, col_desc, values in zip(columns, description, values_by_column):
+        dtype = dtypes.get(name, _column_dtype(col_desc[1]))
+        data[name] = _build_column(values, dtype, col_desc[1])
+
+    return pd.DataFrame(data, columns=columns)
+
+
+def apply_column_dtypes(df: pd.DataFrame, dtypes: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Re-applies the target dtypes to a frame read back from disk.
+
+    Parquet/Arrow only round-trip string categoricals, so e.g. an integer
+    CompletedBy category comes back as int64.
+    """
+    if dtypes is None:
+        dtypes = TASK_COLUMN_DTYPES
+
+    changes = {
+        name: dtype
+        for name, dtype in dtypes.items()
+        if name in df.columns and str(df[name].dtype) != dtype
+    }
+    return df.astype(changes) if changes else df
+
+
+def concat_frames(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates chunks without losing categorical dtypes.
+
+    pd.concat turns categoricals with different categories into object
+    columns, so the categories are unioned across chunks first.
+    """
+    frames = [f for f in frames if f is not None]
+    if not frames:
+        return pd.DataFrame()
+    if len(frames) == 1:
+        return frames[0]
+
+    first = frames[0]
+    for name in first.columns:
+        if isinstance(first[name].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals(
+                [f[name] for f in frames if name in f.columns], ignore_order=True
+            ).categories
+            frames = [
+                f.assign(**{name: f[name].cat.set_categories(categories)})
+                if name in f.columns and isinstance(f[name].dtype, pd.CategoricalDtype)
+                else f
+                for f in frames
+            ]
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def execute_sql_to_dataframe(
+    sql_query_file: str,
+    params: Params = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    cache: Optional[ResultCache] = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
     """
     Connects to the SQL Server database, executes the SQL query, and returns a DataFrame.
+
+    If the query names parameters (`:start`, `:end`), pass their values as a dict
+    via `params` (e.g. window_params(start, end) for task_by_tech_eff.sql) so the
+    filter runs on the server instead of in pandas; a query with plain `?`
+    placeholders takes them as a list, in order. Columns are built directly as
+    typed arrays (see rows_to_dataframe); `dtypes` overrides TASK_COLUMN_DTYPES.
+
+    With a `cache`, a stored result for the same SQL text and params is returned
+    without touching the database (unless refresh=True), and fresh results are stored.
     """
 
     query = read_sql_query(sql_query_file)
     if not query:
         return pd.DataFrame()
+    return execute_query_to_dataframe(query, params, dtypes=dtypes, cache=cache, refresh=refresh)
 
-    creds = get_sql_server_credentials()
-    conn = None
 
-    # 🌟 NEW: Define the ODBC Driver (You may need to adjust this)
-    # Common driver names include 'ODBC Driver 17 for SQL Server' or 'SQL Server'
-    driver = "{ODBC Driver 17 for SQL Server}"
+def execute_query_to_dataframe(
+    query: str,
+    params: Params = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    cache: Optional[ResultCache] = None,
+    refresh: bool = False,
+) -> pd.DataFrame:
+    """execute_sql_to_dataframe for SQL text, e.g. a query built with sql_templates."""
+    query, params = bind(query, params)
+    key = cache_key(query, params) if cache is not None else None
+    if cache is not None and not refresh:
+        table = cache.get(key)
+        if table is not None:
+            print(f"Using cached query result ({table.num_rows} rows); skipping the database.")
+            count("query_cache.hits")
+            with span("query_cache.read"):
+                return apply_column_dtypes(table.to_pandas(), dtypes)
+        count("query_cache.misses")
 
-    conn_str = (
-        f"DRIVER={driver};"
-        f'SERVER={creds["SERVER"]};'
-        f'DATABASE={creds["DATABASE"]};'
-        f'UID={creds["USERNAME"]};'
-        f'PWD={creds["PASSWORD"]}'
-    )
+    # Retry once on a fresh connection if a pooled one turns out to be dead
+    for attempt in (1, 2):
+        try:
+            # 3. Borrow a pooled connection (only the first query pays the login)
+            with get_pool().connection() as conn:
 
-    try:
-        # 3. Establish connection using pyodbc
-        print(f"Connecting to SQL Server: {creds['SERVER']}/{creds['DATABASE']}")
-        conn = pyodbc.connect(conn_str)
+                # 4. Execute and fetch straight into typed columns;
+                # params are bound server-side by pyodbc as `?` parameters
+                print("Executing query and fetching data...")
+                cursor = conn.cursor()
+                with span("db.execute"):
+                    cursor.execute(query, *(params or []))
+                with span("db.fetch"):
+                    rows = cursor.fetchall()
+                df = rows_to_dataframe(rows, cursor.description, dtypes)
+                cursor.close()
 
-        # 4. Use pandas to read SQL
-        print("Executing query and fetching data...")
-        # pd.read_sql is compatible with the pyodbc Connection object
-        df = pd.read_sql(query, conn)
+            print(f"Successfully loaded {len(df)} rows into DataFrame.")
+            count("db.rows", len(df))
+            if cache is not None:
+                writer = cache.writer(key)
+                writer.write(df)
+                writer.commit()
+            return df
 
-        print(f"Successfully loaded {len(df)} rows into DataFrame.")
-        return df
+        except pyodbc.Error as e:
+            if attempt == 1 and is_disconnect_error(e):
+                print(f"Database connection lost ({e}); reconnecting...")
+                continue
+            print(f"SQL Server (pyodbc) error occurred: {e}")
+            return pd.DataFrame()
 
-    except pyodbc.Error as e:
-        print(f"SQL Server (pyodbc) error occurred: {e}")
-        return pd.DataFrame()
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            return pd.DataFrame()
 
-    except Exception as e:
-        print(f"An unexpected error occurred: {e}")
-        return pd.DataFrame()
+    return pd.DataFrame()
+
+
+def iter_sql_dataframes(
+    sql_query_file: str,
+    params: Params = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]] = None,
+    dtypes: Optional[Dict[str, str]] = None,
+    cache: Optional[ResultCache] = None,
+    refresh: bool = False,
+) -> Iterator[pd.DataFrame]:
+    """
+    Streams the query result as DataFrame chunks of at most `chunk_size` rows.
+
+    Each chunk is passed through `transform` (e.g. dtype conversion and the
+    date-window filter) as it arrives, so peak memory is bounded by the chunk
+    size instead of the full result. An empty result still yields one empty
+    chunk carrying the column names. Chunks are typed the same way as in
+    execute_sql_to_dataframe; combine them with concat_frames.
+
+    Unlike execute_sql_to_dataframe, errors are printed and then re-raised: a
+    stream that fails halfway must not look like a complete (shorter) result.
+
+    With a `cache`, a stored result for the same SQL text and params is streamed
+    from the memory-mapped file instead (unless refresh=True). Otherwise the raw
+    chunks are written to the cache as they arrive and published only once the
+    whole result has been read.
+    """
+    query = read_sql_query(sql_query_file)
+    if not query:
+        raise FileNotFoundError(sql_query_file)
+
+    query, params = bind(query, params)
+    key = cache_key(query, params) if cache is not None else None
+    if cache is not None and not refresh:
+        table = cache.get(key)
+        if table is not None:
+            print(f"Using cached query result ({table.num_rows} rows); skipping the database.")
+            count("query_cache.hits")
+            yield from _iter_cached_table(table, chunk_size, transform, dtypes)
+            return
+        count("query_cache.misses")
 
+    writer = cache.writer(key) if cache is not None else None
+    try:
+        yield from _iter_query(query, params, chunk_size, transform, dtypes, writer)
+        if writer is not None:
+            writer.commit()
     finally:
-        # 5. Close connection
-        if conn:
-            conn.close()
-            print("Database connection closed.")
+        if writer is not None:
+            # No-op after commit; drops the partial file on errors or early close
+            writer.abort()
+
+
+def _iter_cached_table(
+    table: "pa.Table",
+    chunk_size: int,
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+    dtypes: Optional[Dict[str, str]],
+) -> Iterator[pd.DataFrame]:
+    """Yields a cached Arrow table in chunk_size slices, typed like fresh chunks."""
+    batches = table.to_batches(max_chunksize=chunk_size) or [table.schema.empty_table()]
+    for batch in batches:
+        with span("query_cache.read"):
+            chunk = apply_column_dtypes(batch.to_pandas(), dtypes)
+        yield transform(chunk) if transform else chunk
+
+
+def _iter_query(
+    query: str,
+    params: Optional[Sequence],
+    chunk_size: int,
+    transform: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+    dtypes: Optional[Dict[str, str]],
+    writer: Optional[ResultWriter],
+) -> Iterator[pd.DataFrame]:
+    total_rows = 0
+    yielded = False
+
+    # Retry once on a fresh connection if a pooled one is dead, but only
+    # before the first chunk has been handed to the caller
+    for attempt in (1, 2):
+        try:
+            with get_pool().connection() as conn:
+                print(f"Executing query and streaming data in chunks of {chunk_size:,} rows...")
+                cursor = conn.cursor()
+                try:
+                    with span("db.execute"):
+                        cursor.execute(query, *(params or []))
+
+                    while True:
+                        with span("db.fetch"):
+                            rows = cursor.fetchmany(chunk_size)
+                        if not rows and yielded:
+                            break
+
+                        chunk = rows_to_dataframe(rows, cursor.description, dtypes)
+                        total_rows += len(chunk)
+                        yielded = True
+                        if writer is not None:
+                            # Store the raw chunk before transform filters/mutates it
+                            writer.write(chunk)
+                        yield transform(chunk) if transform else chunk
+
+                        if len(rows) < chunk_size:
+                            break
+                finally:
+                    # Drop any unread results so the pooled connection is reusable
+                    cursor.close()
+
+            print(f"Successfully streamed {total_rows} rows.")
+            count("db.rows", total_rows)
+            return
+
+        except pyodbc.Error as e:
+            if attempt == 1 and not yielded and is_disconnect_error(e):
+                print(f"Database connection lost ({e}); reconnecting...")
+                continue
+            print(f"SQL Server (pyodbc) error occurred after {total_rows} rows: {e}")
+            raise
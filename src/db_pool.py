@@ -0,0 +1,232 @@
+# src/db_pool.py
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import pyodbc
+
+from .config import sql_server_credentials
+from .metrics import span
+
+# SQLSTATEs that mean the connection itself is gone (not a bad query):
+# 08S01 communication link failure, 08001 unable to connect,
+# 08003 connection not open, 08007 failure during transaction, HYT00/HYT01 timeouts
+DISCONNECT_SQLSTATES = {"08S01", "08001", "08003", "08007", "HYT00", "HYT01"}
+
+
+def is_disconnect_error(error: Exception) -> bool:
+    """True if a pyodbc error means the connection is dead and worth replacing."""
+    if not isinstance(error, pyodbc.Error):
+        return False
+    sqlstate = error.args[0] if error.args else ""
+    return sqlstate in DISCONNECT_SQLSTATES or isinstance(error, (pyodbc.OperationalError, pyodbc.InterfaceError))
+
+
+class ConnectionPool:
+    """
+    Small thread-safe pool of pyodbc connections shared by every query in a process.
+
+    - Idle connections older than `max_idle_seconds` are closed instead of reused.
+    - Connections idle longer than `health_check_after` seconds get a `SELECT 1`
+      (outside the pool lock) before being handed out; a failed check
+      discards them and a new connection is opened instead.
+    - At most `max_size` connections exist at once; extra callers wait.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], "pyodbc.Connection"],
+        max_size: int = 4,
+        max_idle_seconds: float = 300.0,
+        health_check_after: float = 30.0,
+        acquire_timeout: Optional[float] = 60.0,
+    ):
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_after = health_check_after
+        self.acquire_timeout = acquire_timeout
+
+        # (connection, time it was returned to the pool), most recent last
+        self._idle: List[Tuple["pyodbc.Connection", float]] = []
+        self._in_use = 0
+        self._closed = False
+        self._lock = threading.Condition()
+
+        # Simple counters so callers can see how much reuse they get
+        self.created = 0
+        self.reused = 0
+        self.discarded = 0
+
+    # ---------------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------------
+    def _close_quietly(self, conn):
+        self.discarded += 1
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn) -> bool:
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _evict_stale(self, now: float):
+        """Closes idle connections past max_idle_seconds (caller holds the lock)."""
+        fresh = []
+        for conn, returned_at in self._idle:
+            if now - returned_at > self.max_idle_seconds:
+                self._close_quietly(conn)
+            else:
+                fresh.append((conn, returned_at))
+        self._idle = fresh
+
+    # ---------------------------------------------------------------
+    # Public API
+    # ---------------------------------------------------------------
+    def acquire(self) -> "pyodbc.Connection":
+        """Hands out a live connection, reusing an idle one when possible."""
+        deadline = None if self.acquire_timeout is None else time.monotonic() + self.acquire_timeout
+        conn, check = None, False
+
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self._evict_stale(now)
+
+                if self._idle:
+                    # Take it and reserve its slot; the health check runs outside
+                    # the lock, so a hung connection only blocks this caller
+                    conn, returned_at = self._idle.pop()
+                    check = now - returned_at > self.health_check_after
+                    self._in_use += 1
+                    break
+
+                if self._in_use < self.max_size:
+                    # Reserve the slot, then connect outside the lock
+                    self._in_use += 1
+                    break
+
+                remaining = None if deadline is None else deadline - now
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No database connection free after {self.acquire_timeout}s")
+                self._lock.wait(remaining)
+
+        if conn is not None:
+            if not check or self._is_healthy(conn):
+                with self._lock:
+                    self.reused += 1
+                return conn
+            # Dead: replace it with a new connection in the slot it already holds
+            with self._lock:
+                self.discarded += 1
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self.created += 1
+        return conn
+
+    def release(self, conn, broken: bool = False):
+        """Returns a connection to the pool; broken connections are closed instead."""
+        with self._lock:
+            self._in_use -= 1
+            if broken or self._closed:
+                self._close_quietly(conn)
+            else:
+                try:
+                    # Never hand out a connection with an open transaction
+                    conn.rollback()
+                    self._idle.append((conn, time.monotonic()))
+                except Exception:
+                    self._close_quietly(conn)
+            self._lock.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator["pyodbc.Connection"]:
+        """
+        with pool.connection() as conn: ...
+
+        The connection goes back to the pool afterwards, unless the block
+        raised a disconnect-type error, in which case it is thrown away.
+        """
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except Exception as e:
+            broken = is_disconnect_error(e)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def close_all(self):
+        """Closes every idle connection; in-use ones are closed when released."""
+        with self._lock:
+            self._closed = True
+            for conn, _ in self._idle:
+                self._close_quietly(conn)
+            self._idle = []
+
+
+def get_sql_server_credentials() -> dict:
+    """Fetches SQL Server credentials from environment variables (parsed once)."""
+    # Fetch all the necessary credentials defined in your .env
+    return sql_server_credentials()
+
+
+def get_connection_string() -> str:
+    """Builds the pyodbc connection string from the SQL Server credentials."""
+    creds = get_sql_server_credentials()
+
+    # 🌟 NEW: Define the ODBC Driver (You may need to adjust this)
+    # Common driver names include 'ODBC Driver 17 for SQL Server' or 'SQL Server'
+    driver = "{ODBC Driver 17 for SQL Server}"
+
+    return (
+        f"DRIVER={driver};"
+        f'SERVER={creds["SERVER"]};'
+        f'DATABASE={creds["DATABASE"]};'
+        f'UID={creds["USERNAME"]};'
+        f'PWD={creds["PASSWORD"]}'
+    )
+
+
+_POOL: Optional[ConnectionPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def _connect() -> "pyodbc.Connection":
+    creds = get_sql_server_credentials()
+    print(f"Connecting to SQL Server: {creds['SERVER']}/{creds['DATABASE']}")
+    with span("db.connect"):
+        return pyodbc.connect(get_connection_string())
+
+
+def get_pool() -> ConnectionPool:
+    """Process-wide connection pool shared by every query (created on first use)."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = ConnectionPool(_connect)
+            atexit.register(_POOL.close_all)
+        return _POOL
@@ -0,0 +1,131 @@
+# src/employees.py
+"""
+Employee dimension for the task rows.
+
+task_by_tech_eff.sql returns only CompletedBy; technician names come from
+sql_query/employees.sql, fetched once (cached on disk for a day and in
+memory for the life of the process) and mapped onto each chunk through the
+CompletedBy categories, so every name is stored once instead of per row.
+A CompletedBy missing from the cache (someone added since it was filled)
+triggers one re-fetch from the live table before its rows are dropped.
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .config import get_env
+from .db_handler import execute_sql_to_dataframe
+from .result_cache import DEFAULT_CACHE_DIR, ResultCache
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+EMPLOYEES_SQL_PATH = BASE_DIR.parent / "sql_query" / "employees.sql"
+EMPLOYEE_CACHE_DIR = DEFAULT_CACHE_DIR.parent / "employees"
+
+# Names change rarely; EMPLOYEES_CACHE_TTL_SECONDS overrides
+DEFAULT_TTL_SECONDS = 24 * 3600
+
+KEY_COL = 'CompletedBy'
+NAME_COL = 'Name'
+
+_EMPLOYEES: Optional[Tuple[float, pd.Series]] = None
+_EMPLOYEES_LOCK = threading.Lock()
+# CompletedBy values a re-fetch already failed to find; cleared when the names expire
+_REFETCHED_FOR: set = set()
+
+logger = logging.getLogger(__name__)
+
+
+def _ttl_seconds() -> float:
+    return float(get_env("EMPLOYEES_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+
+
+def fetch_employee_names(refresh: bool = False) -> pd.Series:
+    """Name by EmployeeID from employees.sql, through a day-long result cache."""
+    cache = ResultCache(root=EMPLOYEE_CACHE_DIR, ttl_seconds=_ttl_seconds())
+    df = execute_sql_to_dataframe(str(EMPLOYEES_SQL_PATH), dtypes={}, cache=cache, refresh=refresh)
+    if not {"EmployeeID", NAME_COL} <= set(df.columns):
+        # A failed lookup must not silently drop every task row
+        raise RuntimeError(f"Employee lookup failed ({EMPLOYEES_SQL_PATH.name} returned no result)")
+    return pd.Series(df[NAME_COL].to_numpy(dtype=object), index=df["EmployeeID"].to_numpy(), name=NAME_COL)
+
+
+def get_employee_names(refresh: bool = False) -> pd.Series:
+    """Process-wide employee names, re-fetched once they are older than the TTL."""
+    global _EMPLOYEES
+    with _EMPLOYEES_LOCK:
+        if refresh or _EMPLOYEES is None or time.monotonic() - _EMPLOYEES[0] > _ttl_seconds():
+            if not refresh:
+                _REFETCHED_FOR.clear()
+            _EMPLOYEES = (time.monotonic(), fetch_employee_names(refresh=refresh))
+        return _EMPLOYEES[1]
+
+
+def _refetch_for(unknown) -> Optional[pd.Series]:
+    """Fresh names from the live table, unless a re-fetch already missed all of `unknown`."""
+    with _EMPLOYEES_LOCK:
+        new = set(unknown) - _REFETCHED_FOR
+        if not new:
+            return None
+        _REFETCHED_FOR.update(new)
+    print(f"   {len(new)} CompletedBy value(s) not in the employee cache; re-fetching names")
+    return get_employee_names(refresh=True)
+
+
+def attach_employee_names(df: pd.DataFrame, names: Optional[pd.Series] = None) -> pd.DataFrame:
+    """
+    Adds a categorical Name column right after CompletedBy.
+
+    Names are looked up once per CompletedBy category, not once per row.
+    Rows whose CompletedBy has no employee are dropped, as the SQL INNER JOIN
+    on dbo.employees used to do; with the cached names (no `names` given),
+    unknown CompletedBy values first trigger one re-fetch. A Name column already present (older cache
+    entries or task-store partitions) is replaced, so all rows agree.
+    """
+    if KEY_COL not in df.columns:
+        return df
+    cached = names is None
+    if cached:
+        names = get_employee_names()
+    if NAME_COL in df.columns:
+        df = df.drop(columns=NAME_COL)
+
+    tech = df[KEY_COL]
+    if isinstance(tech.dtype, pd.CategoricalDtype):
+        row_codes, categories = tech.cat.codes.to_numpy(), tech.cat.categories
+    else:
+        row_codes, categories = pd.factorize(tech)
+
+    # Name code for every CompletedBy category (-1: not an employee)
+    positions = names.index.get_indexer(categories)
+    if cached and (positions < 0).any():
+        used = np.zeros(len(categories), dtype=bool)
+        used[row_codes[row_codes >= 0]] = True
+        unknown = categories[used & (positions < 0)]
+        if len(unknown):
+            refreshed = _refetch_for(unknown)
+            if refreshed is not None:
+                names = refreshed
+                positions = names.index.get_indexer(categories)
+    known = positions >= 0
+    name_codes, unique_names = pd.factorize(names.to_numpy()[positions[known]])
+    category_to_name = np.full(len(categories), -1, dtype=np.int64)
+    category_to_name[known] = name_codes
+
+    codes = np.where(row_codes >= 0, category_to_name[row_codes], -1) if len(categories) else row_codes
+    name_column = pd.Categorical.from_codes(codes, categories=pd.Index(unique_names, dtype=object))
+
+    columns = list(df.columns)
+    columns.insert(columns.index(KEY_COL) + 1, NAME_COL)
+    df = df.assign(**{NAME_COL: name_column})[columns]
+
+    missing = codes < 0
+    if missing.any():
+        logger.warning("Dropped %d rows with no matching employee", missing.sum())
+        df = df[~missing]
+    return df
@@ -0,0 +1,75 @@
+# src/fingerprints.py
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .config import get_env
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_FINGERPRINT_PATH = BASE_DIR.parent / ".cache" / "tab_fingerprints.json"
+
+# Developer metadata key used when SHEETS_FINGERPRINT_METADATA is enabled
+METADATA_KEY = "daily_eff_fingerprint"
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Cheap content hash of a DataFrame: column names, dtypes and every row.
+
+    Rows are hashed with pd.util.hash_pandas_object and the row hashes are
+    sorted before digesting. The query's ORDER BY Task does not give a unique
+    order, so the same rows can come back in a different order between runs.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode("utf-8"))
+    if len(df):
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        digest.update(np.sort(row_hashes).tobytes())
+    return digest.hexdigest()
+
+
+def metadata_enabled() -> bool:
+    """True if fingerprints should also be kept in each tab's developer metadata."""
+    return (get_env("SHEETS_FINGERPRINT_METADATA") or "").strip().lower() in ("1", "true", "yes")
+
+
+class TabFingerprints:
+    """Fingerprint of the last successful upload of each tab, kept in .cache/tab_fingerprints.json."""
+
+    def __init__(self, path: Path = DEFAULT_FINGERPRINT_PATH):
+        self.path = Path(path)
+        # Entries are per spreadsheet, so pointing at another sheet never skips an upload
+        self.spreadsheet_id = get_env("GOOGLE_SPREADSHEET_ID") or ""
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _key(self, sheet_name: str) -> str:
+        return f"{self.spreadsheet_id}/{sheet_name}"
+
+    def get(self, sheet_name: str) -> Optional[str]:
+        entry = self._read().get(self._key(sheet_name))
+        return entry.get("fingerprint") if entry else None
+
+    def record(self, fingerprints: Dict[str, str]):
+        state = self._read()
+        uploaded_at = datetime.now().isoformat(timespec="seconds")
+        for sheet_name, fingerprint in fingerprints.items():
+            state[self._key(sheet_name)] = {"fingerprint": fingerprint, "uploaded_at": uploaded_at}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,92 @@
+# src/freshness.py
+"""
+Cheap "anything new?" check that runs before pandas or gspread are imported.
+
+The report query is wrapped as a derived table and reduced to
+COUNT(*) / MAX(CompleteDate) for the run's window. If that matches what the
+last successful run of the same reports uploaded for the same window, the
+tabs are already current and the run can stop right there.
+"""
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+from .sql_templates import base_query, bind, window_params
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_STATE_PATH = BASE_DIR.parent / ".cache" / "run_state.json"
+
+DATE_COL = 'CompleteDate'
+
+Window = Tuple[datetime, datetime]
+
+
+def probe_query(query: str) -> str:
+    """COUNT(*) and MAX(CompleteDate) over exactly the rows `query` returns."""
+    return (
+        # ROWCOUNT is a reserved word in T-SQL, hence the brackets
+        f"SELECT COUNT(*) AS [RowCount], MAX(q.{DATE_COL}) AS [Latest{DATE_COL}]\n"
+        f"FROM (\n{base_query(query)}\n) AS q;"
+    )
+
+
+def probe_window(sql_query_file: str, window: Window) -> dict:
+    """Runs the probe for [start, end) on a pooled connection (pyodbc only)."""
+    from .db_pool import get_pool
+
+    with open(sql_query_file, "r") as f:
+        query = probe_query(f.read())
+
+    start_time, end_time = window
+    with get_pool().connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(*bind(query, window_params(start_time, end_time)))
+        row_count, latest = cursor.fetchone()
+        cursor.close()
+
+    return {
+        "window": [start_time.isoformat(), end_time.isoformat()],
+        "rows": int(row_count or 0),
+        "latest": latest.isoformat() if latest is not None else None,
+    }
+
+
+class RunState:
+    """Fingerprint of the data each report set last uploaded, kept in .cache/run_state.json."""
+
+    def __init__(self, path: Path = DEFAULT_STATE_PATH):
+        self.path = Path(path)
+
+    def _read(self) -> dict:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    @staticmethod
+    def key(report_names: Sequence[str]) -> str:
+        return ",".join(report_names)
+
+    def last_fingerprint(self, report_names: Sequence[str]) -> Optional[dict]:
+        return self._read().get(self.key(report_names))
+
+    def record(self, report_names: Sequence[str], fingerprint: dict):
+        state = self._read()
+        state[self.key(report_names)] = {**fingerprint, "uploaded_at": datetime.now().isoformat(timespec="seconds")}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+def unchanged_since_last_run(last: Optional[dict], current: dict) -> bool:
+    """True when the same window still holds the same rows as the last upload."""
+    if not last:
+        return False
+    return all(last.get(k) == current[k] for k in ("window", "rows", "latest"))
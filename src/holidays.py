@@ -1,6 +1,8 @@
 # src/holidays.py
+from bisect import bisect_left, bisect_right
 from datetime import datetime, date, timedelta
-from typing import Set
+from functools import lru_cache
+from typing import Iterable, List, Optional, Set
 
 
 def get_company_holidays(year: int) -> Set[date]:
@@ -70,6 +72,137 @@ def get_all_company_holidays(start_year: int = 2025, end_year: int = None) -> Se
     return all_holidays
 
 
+class BusinessCalendar:
+    """
+    Precomputed business-day calendar (weekdays minus company holidays).
+
+    Business days between `start` and `end` are stored once as a sorted list of
+    date ordinals, so previous/next business day and business-day counts are
+    bisect lookups instead of day-by-day walks over the holiday set. Dates
+    outside the precomputed range fall back to the walking logic.
+    """
+
+    # Monday–Friday, in the format numpy's busday functions expect
+    WEEKMASK = "1111100"
+
+    def __init__(self, holidays: Iterable[date], start: date, end: date):
+        self.start = start
+        self.end = end
+        self.holidays = frozenset(holidays)
+
+        self._ordinals: List[int] = [
+            ordinal
+            for ordinal in range(start.toordinal(), end.toordinal() + 1)
+            if date.fromordinal(ordinal).weekday() < 5
+            and date.fromordinal(ordinal) not in self.holidays
+        ]
+        self._busdaycal = None
+
+    def _covers(self, day: date) -> bool:
+        return self.start <= day <= self.end
+
+    def is_business_day(self, day: date) -> bool:
+        """True if day is a weekday and not a company holiday."""
+        if not self._covers(day):
+            return day.weekday() < 5 and day not in self.holidays
+        ordinal = day.toordinal()
+        i = bisect_left(self._ordinals, ordinal)
+        return i < len(self._ordinals) and self._ordinals[i] == ordinal
+
+    def previous_business_day(self, day: date) -> date:
+        """Most recent business day strictly before day."""
+        i = bisect_left(self._ordinals, day.toordinal()) - 1
+        if self._covers(day) and i >= 0:
+            return date.fromordinal(self._ordinals[i])
+
+        candidate = day - timedelta(days=1)
+        while not self.is_business_day(candidate):
+            candidate -= timedelta(days=1)
+        return candidate
+
+    def next_business_day(self, day: date) -> date:
+        """First business day strictly after day."""
+        i = bisect_right(self._ordinals, day.toordinal())
+        if self._covers(day) and i < len(self._ordinals):
+            return date.fromordinal(self._ordinals[i])
+
+        candidate = day + timedelta(days=1)
+        while not self.is_business_day(candidate):
+            candidate += timedelta(days=1)
+        return candidate
+
+    def business_days(self, start: date, end: date) -> List[date]:
+        """Every business day in [start, end)."""
+        if self._covers(start) and self._covers(end - timedelta(days=1)):
+            lo = bisect_left(self._ordinals, start.toordinal())
+            hi = bisect_left(self._ordinals, end.toordinal())
+            return [date.fromordinal(o) for o in self._ordinals[lo:hi]]
+
+        return [
+            start + timedelta(days=i)
+            for i in range((end - start).days)
+            if self.is_business_day(start + timedelta(days=i))
+        ]
+
+    def business_days_between(self, start: date, end: date) -> int:
+        """Number of business days in [start, end)."""
+        if self._covers(start) and self._covers(end - timedelta(days=1)):
+            return bisect_left(self._ordinals, end.toordinal()) - bisect_left(self._ordinals, start.toordinal())
+        return len(self.business_days(start, end))
+
+    # ---------------------------------------------------------------
+    # Vectorized helpers (numpy/pandas are only imported when used)
+    # ---------------------------------------------------------------
+    def numpy_calendar(self):
+        """numpy.busdaycalendar with the same weekmask and holidays."""
+        if self._busdaycal is None:
+            import numpy as np
+            self._busdaycal = np.busdaycalendar(
+                weekmask=self.WEEKMASK,
+                holidays=sorted(self.holidays),
+            )
+        return self._busdaycal
+
+    def is_business_day_array(self, values):
+        """
+        Vectorized "is business day" over a date/datetime column or array.
+
+        Accepts a pandas Series/Index or anything numpy can turn into
+        datetime64; returns a boolean numpy array (NaT → False).
+        """
+        import numpy as np
+        days = np.asarray(values, dtype="datetime64[ns]").astype("datetime64[D]")
+        return np.is_busday(days, busdaycal=self.numpy_calendar())
+
+    def custom_business_day(self, n: int = 1):
+        """pandas CustomBusinessDay offset honouring the company holidays."""
+        import pandas as pd
+        return pd.offsets.CustomBusinessDay(
+            n=n,
+            weekmask="Mon Tue Wed Thu Fri",
+            holidays=sorted(self.holidays),
+        )
+
+
+@lru_cache(maxsize=8)
+def _build_business_calendar(start_year: int, end_year: int) -> BusinessCalendar:
+    return BusinessCalendar(
+        get_all_company_holidays(start_year, end_year),
+        start=date(start_year, 1, 1),
+        end=date(end_year, 12, 31),
+    )
+
+
+def get_business_calendar(start_year: int = 2025, end_year: Optional[int] = None) -> BusinessCalendar:
+    """
+    Cached BusinessCalendar for the given years (default: 2025 to today + 2 years,
+    the same range get_all_company_holidays() uses).
+    """
+    if end_year is None:
+        end_year = date.today().year + 2
+    return _build_business_calendar(start_year, end_year)
+
+
 def previous_business_day(reference_date: date = None, holidays: Set[date] = None) -> date:
     """
     Returns the most recent business day BEFORE reference_date (default: today)
@@ -79,7 +212,8 @@ def previous_business_day(reference_date: date = None, holidays: Set[date] = Non
         reference_date = date.today()
 
     if holidays is None:
-        holidays = get_all_company_holidays()
+        # Precomputed, cached calendar: a bisect lookup instead of a walk
+        return get_business_calendar().previous_business_day(reference_date)
 
     candidate = reference_date - timedelta(days=1)
 
@@ -0,0 +1,182 @@
+# src/metrics.py
+import json
+import os
+import re
+import threading
+import time
+from contextlib import ContextDecorator
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+from .config import get_env
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_METRICS_FILE = BASE_DIR.parent / ".cache" / "metrics" / "runs.jsonl"
+
+# Set METRICS_PROMETHEUS_DIR to a node_exporter textfile-collector directory
+# to also export the last run of each report set as gauges
+PROMETHEUS_PREFIX = "daily_eff"
+
+
+class MetricsRecorder:
+    """
+    Thread-safe collector for one run: per-stage timings and named counters.
+
+    Spans with the same name are aggregated (count, total and max seconds),
+    so per-chunk stages such as fetching or date parsing add up to one entry.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self, **labels):
+        with self._lock:
+            self.labels = labels
+            self.started_at = datetime.now()
+            self._started = time.perf_counter()
+            self.stages: Dict[str, Dict[str, float]] = {}
+            self.counters: Dict[str, float] = {}
+
+    def record_span(self, name: str, seconds: float, error: bool = False):
+        with self._lock:
+            stage = self.stages.setdefault(name, {"count": 0, "errors": 0, "total_s": 0.0, "max_s": 0.0})
+            stage["count"] += 1
+            stage["errors"] += int(error)
+            stage["total_s"] += seconds
+            stage["max_s"] = max(stage["max_s"], seconds)
+
+    def count(self, name: str, value: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_s": round(time.perf_counter() - self._started, 4),
+                **self.labels,
+                "stages": {
+                    name: {**stage, "total_s": round(stage["total_s"], 4), "max_s": round(stage["max_s"], 4)}
+                    for name, stage in self.stages.items()
+                },
+                "counters": dict(self.counters),
+            }
+
+
+_RECORDER = MetricsRecorder()
+
+
+def get_recorder() -> MetricsRecorder:
+    return _RECORDER
+
+
+class span(ContextDecorator):
+    """
+    Times a stage, as a context manager or a decorator:
+
+        with span("db.execute"): ...
+
+        @span("parse_dates")
+        def parse_dates(chunk): ...
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._start = None
+
+    def _recreate_cm(self):
+        # A fresh instance per decorated call, so concurrent calls don't share _start
+        return span(self.name)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _RECORDER.record_span(self.name, time.perf_counter() - self._start, error=exc_type is not None)
+        return False
+
+
+def count(name: str, value: float = 1):
+    """Adds value to a run counter (rows fetched, bytes sent, API calls, ...)."""
+    _RECORDER.count(name, value)
+
+
+def start_run(**labels):
+    """Clears the recorder; labels (e.g. reports=...) are stored with the run."""
+    _RECORDER.reset(**labels)
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{PROMETHEUS_PREFIX}_{name}")
+
+
+def _label_value(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def prometheus_text(record: dict) -> str:
+    """Renders one run record in the Prometheus text exposition format."""
+    job = _label_value(record.get("reports", ""))
+    lines = [
+        f"# HELP {PROMETHEUS_PREFIX}_stage_seconds Seconds spent in each stage during the last run",
+        f"# TYPE {PROMETHEUS_PREFIX}_stage_seconds gauge",
+    ]
+    for stage, values in sorted(record["stages"].items()):
+        lines.append(f'{PROMETHEUS_PREFIX}_stage_seconds{{reports="{job}",stage="{_label_value(stage)}"}} {values["total_s"]}')
+
+    for name, value in sorted(record["counters"].items()):
+        metric = _metric_name(name)
+        lines.append(f"# TYPE {metric} gauge")
+        lines.append(f'{metric}{{reports="{job}"}} {value}')
+
+    lines += [
+        f"# TYPE {PROMETHEUS_PREFIX}_run_duration_seconds gauge",
+        f'{PROMETHEUS_PREFIX}_run_duration_seconds{{reports="{job}"}} {record["duration_s"]}',
+        f"# TYPE {PROMETHEUS_PREFIX}_run_success gauge",
+        f'{PROMETHEUS_PREFIX}_run_success{{reports="{job}"}} {int(bool(record.get("success")))}',
+        f"# TYPE {PROMETHEUS_PREFIX}_run_timestamp_seconds gauge",
+        f'{PROMETHEUS_PREFIX}_run_timestamp_seconds{{reports="{job}"}} {time.time():.0f}',
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def _write_prometheus(record: dict, directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    name = re.sub(r"[^a-zA-Z0-9_]", "_", str(record.get("reports", "run")))
+    path = directory / f"{PROMETHEUS_PREFIX}_{name}.prom"
+    # Write-then-rename so the collector never reads a half-written file
+    tmp_path = path.with_suffix(".prom.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(prometheus_text(record))
+    os.replace(tmp_path, path)
+
+
+def finish_run(success: bool, path: Optional[Path] = None) -> dict:
+    """
+    Appends the run (stages, counters, success) as one JSON line and, if
+    METRICS_PROMETHEUS_DIR is set, refreshes its Prometheus textfile.
+    Failing to write metrics never fails the run.
+    """
+    record = _RECORDER.snapshot()
+    record["success"] = success
+
+    if path is None:
+        path = Path(get_env("METRICS_FILE", DEFAULT_METRICS_FILE))
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+
+        prometheus_dir = get_env("METRICS_PROMETHEUS_DIR")
+        if prometheus_dir:
+            _write_prometheus(record, Path(prometheus_dir))
+    except OSError as e:
+        print(f"⚠️ Could not write run metrics: {e}")
+
+    slowest = sorted(record["stages"].items(), key=lambda item: item[1]["total_s"], reverse=True)
+    print("Stage timings: " + ", ".join(f"{name} {values['total_s']:.2f}s" for name, values in slowest))
+    return record
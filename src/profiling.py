@@ -0,0 +1,200 @@
+# src/profiling.py
+"""
+Opt-in profiling of one run (`python -m src.runner daily --profile`).
+
+cpu     cProfile over the whole run. cProfile follows a single call stack,
+        so work on pool threads is either missed or attributed to the wrong
+        callers, and a second profiler per thread is refused on Python 3.12+.
+        The run's pool therefore comes from worker_pool(), which runs the
+        jobs inline (serialization and uploads included) while a CPU profile
+        is active. Writes cpu.prof, which pstats or snakeviz can load, and
+        cpu.txt with the top functions.
+memory  tracemalloc, with a snapshot at every stage boundary the pipeline
+        marks with checkpoint(): fetch, filter, serialize, upload. Writes one
+        .snapshot file per boundary (tracemalloc.Snapshot.load) and memory.txt
+        with the traced and peak memory of each stage and the source lines
+        that grew most since the previous boundary.
+
+Artifacts go to .cache/profiles/<timestamp>-<reports>/ (PROFILE_DIR
+overrides the parent directory); the summary is also printed.
+"""
+import io
+import re
+import threading
+import time
+import tracemalloc
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .config import get_env
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_PROFILE_DIR = BASE_DIR.parent / ".cache" / "profiles"
+
+PROFILE_MODES = ("cpu", "memory")
+
+# Functions / source lines in the printed summary
+DEFAULT_TOP = 25
+
+# Frames kept per allocation: enough to group a saved snapshot by traceback later
+TRACEMALLOC_FRAMES = 5
+
+# Allocations made by the import system or tracemalloc itself are noise here
+_SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+_ACTIVE: Optional["RunProfiler"] = None
+
+
+class StageMemory(NamedTuple):
+    stage: str
+    seconds: float
+    current: int
+    peak: int
+    snapshot: tracemalloc.Snapshot
+
+
+def _mib(size: int) -> str:
+    return f"{size / 2**20:,.1f} MiB"
+
+
+class InlineExecutor(Executor):
+    """Runs each submitted job right away on the calling thread; the returned future is already done."""
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class RunProfiler:
+    """
+    Context manager that profiles everything run inside it:
+
+        with RunProfiler("memory", label="daily"):
+            run_reports(["daily"])
+
+    Failing to write the artifacts never fails the run.
+    """
+
+    def __init__(self, mode: str, label: str = "run", directory: Optional[Path] = None, top: int = DEFAULT_TOP):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r} (expected one of {', '.join(PROFILE_MODES)})")
+        if directory is None:
+            directory = Path(get_env("PROFILE_DIR", DEFAULT_PROFILE_DIR))
+        safe_label = re.sub(r"[^a-zA-Z0-9_.-]", "_", label)
+        self.mode = mode
+        self.top = top
+        self.directory = Path(directory) / f"{datetime.now():%Y%m%d-%H%M%S}-{safe_label}"
+        self.stages: List[StageMemory] = []
+        self._lock = threading.Lock()
+        self._profile = None
+        self._started = 0.0
+
+    def __enter__(self):
+        global _ACTIVE
+        self._started = time.perf_counter()
+        if self.mode == "cpu":
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+        _ACTIVE = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _ACTIVE
+        _ACTIVE = None
+        if self.mode == "cpu":
+            self._profile.disable()
+        else:
+            self.checkpoint("end")
+            tracemalloc.stop()
+
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            summary = self._write_cpu() if self.mode == "cpu" else self._write_memory()
+        except OSError as e:
+            print(f"⚠️ Could not write the profile: {e}")
+            return False
+
+        print(f"\n{summary}")
+        print(f"Profile written to {self.directory}")
+        return False
+
+    def checkpoint(self, stage: str):
+        """Snapshots traced memory; the peak is reset, so each stage reports its own."""
+        if self.mode != "memory" or not tracemalloc.is_tracing():
+            return
+        with self._lock:
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+            self.stages.append(StageMemory(stage, time.perf_counter() - self._started, current, peak, snapshot))
+
+    def _write_cpu(self) -> str:
+        import pstats
+
+        self._profile.dump_stats(str(self.directory / "cpu.prof"))
+
+        out = io.StringIO()
+        stats = pstats.Stats(self._profile, stream=out).strip_dirs()
+        # Own time points at the hot functions; cumulative time at the stages
+        # (threads waiting on futures show up there too)
+        stats.sort_stats("tottime").print_stats(self.top)
+        stats.sort_stats("cumulative").print_stats(self.top)
+        summary = f"CPU profile (top {self.top} functions by own and by cumulative time):\n{out.getvalue().strip()}"
+        (self.directory / "cpu.txt").write_text(summary + "\n", encoding="utf-8")
+        return summary
+
+    def _write_memory(self) -> str:
+        lines = [
+            "Memory profile (tracemalloc):",
+            f"{'stage':<12} {'at':>8} {'traced':>14} {'stage peak':>14}",
+        ]
+        for stage in self.stages:
+            lines.append(f"{stage.stage:<12} {stage.seconds:>7.2f}s {_mib(stage.current):>14} {_mib(stage.peak):>14}")
+
+        previous = None
+        for i, stage in enumerate(self.stages):
+            stage.snapshot.dump(str(self.directory / f"{i:02d}-{stage.stage}.snapshot"))
+            if previous is None:
+                stats = stage.snapshot.statistics("lineno")
+                title = f"\nLargest allocations alive at '{stage.stage}':"
+            else:
+                stats = stage.snapshot.compare_to(previous.snapshot, "lineno")
+                title = f"\nGrowth since '{previous.stage}' at '{stage.stage}':"
+            lines.append(title)
+            lines.extend(f"   {stat}" for stat in stats[:self.top])
+            previous = stage
+
+        summary = "\n".join(lines)
+        (self.directory / "memory.txt").write_text(summary + "\n", encoding="utf-8")
+        return summary
+
+
+def worker_pool(max_workers: int, thread_name_prefix: str = "") -> Executor:
+    """A ThreadPoolExecutor, or an InlineExecutor while a CPU profile is active so the profile sees every job."""
+    profiler = _ACTIVE
+    if profiler is not None and profiler.mode == "cpu":
+        return InlineExecutor()
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+
+
+def checkpoint(stage: str):
+    """Marks a stage boundary for an active memory profile; a no-op otherwise."""
+    profiler = _ACTIVE
+    if profiler is not None:
+        profiler.checkpoint(stage)
@@ -0,0 +1,266 @@
+# src/query_runner.py
+"""
+Runs every tab-annotated query in sql_query/ concurrently and uploads each
+result to its own tab as soon as it arrives.
+
+A query opts in with header comments before its first SQL line:
+
+    -- tab: REJECTED_TASKS
+    -- window: daily
+    -- top: 500
+    -- order: CompleteDate DESC
+
+`tab` is the worksheet the result replaces. `window` names a report in
+reports.REPORTS; its [start, end) fills the query's :start / :end parameters.
+Without a window the query runs without parameters. The optional `top`
+caps the rows SQL Server returns, in `order` (output columns, comma-separated)
+when given (see sql_templates.page_query). Files with no `tab` header
+(task_by_tech_eff.sql) stay with the report registry in runner.py.
+
+Run from the project root:
+    uv run python -m src.query_runner               # every annotated query
+    uv run python -m src.query_runner rejected_tasks
+    uv run python -m src.query_runner --list
+"""
+from __future__ import annotations
+
+import argparse
+import re
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .metrics import count, finish_run, span, start_run
+from .reports import REPORTS
+from .runner import SHEETS_WORKERS, open_sheets
+from .sql_templates import page_params, page_query, window_params
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .sheets_handler import SheetsHandler
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+SQL_DIR = BASE_DIR.parent / "sql_query"
+
+# `-- key: value` lines at the top of a .sql file
+_HEADER = re.compile(r"^--\s*(\w+)\s*:\s*(.+?)\s*$")
+
+
+@dataclass(frozen=True)
+class QuerySpec:
+    """One annotated .sql file and the tab its result is uploaded to."""
+
+    name: str
+    path: Path
+    sheet_name: str
+    # Report whose window supplies the [start, end) parameters, if any
+    window: Optional[str] = None
+    # Server-side row cap and the output columns it keeps the first rows of
+    top: Optional[int] = None
+    order_by: Tuple[str, ...] = ()
+
+    def params(self, now: datetime) -> Dict[str, object]:
+        params: Dict[str, object] = page_params(limit=self.top)
+        if self.window is not None:
+            params.update(window_params(*REPORTS[self.window].window(now)))
+        return params
+
+    def query(self) -> str:
+        """The file's SQL, wrapped with TOP when the header asks for it."""
+        from .db_handler import read_sql_query
+
+        query = read_sql_query(str(self.path))
+        if query and self.top is not None:
+            query = page_query(query, self.order_by, limit=self.top)
+        return query
+
+
+def read_header(path: Path) -> Dict[str, str]:
+    """`-- key: value` comments before the first SQL line, keys lower-cased."""
+    header = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if not line.startswith("--"):
+                break
+            match = _HEADER.match(line)
+            if match:
+                header[match.group(1).lower()] = match.group(2)
+    return header
+
+
+def discover_queries(directory: Path = SQL_DIR) -> List[QuerySpec]:
+    """Every .sql file in `directory` with a `-- tab:` header, sorted by name."""
+    specs = []
+    for path in sorted(Path(directory).glob("*.sql")):
+        header = read_header(path)
+        if "tab" not in header:
+            continue
+
+        window = header.get("window")
+        if window is not None and window not in REPORTS:
+            raise ValueError(f"{path.name}: unknown window '{window}' (expected one of {sorted(REPORTS)})")
+        top = header.get("top")
+        if top is not None and not (top.isdigit() and int(top) > 0):
+            raise ValueError(f"{path.name}: top must be a positive number of rows, not '{top}'")
+        order_by = tuple(column.strip() for column in header.get("order", "").split(",") if column.strip())
+        specs.append(QuerySpec(
+            name=path.stem,
+            path=path,
+            sheet_name=header["tab"],
+            window=window,
+            top=int(top) if top is not None else None,
+            order_by=order_by,
+        ))
+    return specs
+
+
+def run_query(spec: QuerySpec, now: datetime, refresh: bool = False) -> pd.DataFrame:
+    """Runs one query on a pooled connection (through the result cache)."""
+    from .db_handler import execute_query_to_dataframe, get_result_cache
+
+    query = spec.query()
+    if not query:
+        import pandas as pd
+
+        # Same column-less frame execute_sql_to_dataframe returns for a missing file
+        return pd.DataFrame()
+    with span(f"query.{spec.name}"):
+        return execute_query_to_dataframe(
+            query,
+            params=spec.params(now),
+            cache=get_result_cache(),
+            refresh=refresh,
+        )
+
+
+def run_queries(specs: Sequence[QuerySpec], now: Optional[datetime] = None, refresh: bool = False) -> bool:
+    """
+    Runs every query at once, bounded by the connection pool size, and hands
+    each result to an upload thread the moment it finishes.
+
+    The run takes about as long as the slowest query plus its upload, rather
+    than the sum of all of them. Sheets authentication overlaps the queries.
+
+    Returns:
+        bool: True if every query succeeded and its tab was uploaded, False otherwise
+    """
+    from .db_pool import get_pool
+
+    if now is None:
+        now = datetime.now()
+
+    start_run(reports=",".join(f"query:{s.name}" for s in specs), refresh=refresh)
+    print(f"Run started at {now:%Y-%m-%d %H:%M:%S} for {len(specs)} queries")
+    for spec in specs:
+        window = REPORTS[spec.window].label if spec.window else "no window"
+        print(f"   → {spec.name}: {window} → '{spec.sheet_name}'")
+
+    success = False
+    try:
+        # One worker per pooled connection: more would only wait in acquire()
+        with ThreadPoolExecutor(max_workers=get_pool().max_size, thread_name_prefix="query") as queries, \
+                ThreadPoolExecutor(max_workers=SHEETS_WORKERS, thread_name_prefix="sheets") as uploads_pool:
+            sheets_future: Future = uploads_pool.submit(open_sheets)
+            futures = {queries.submit(run_query, spec, now, refresh): spec for spec in specs}
+            success = _upload_as_completed(futures, sheets_future, uploads_pool)
+    finally:
+        finish_run(success)
+
+    print(f"\nRun finished at {datetime.now():%H:%M:%S}\n")
+    return success
+
+
+def _upload_as_completed(
+    futures: Dict[Future, QuerySpec],
+    sheets_future: Future,
+    uploads_pool: ThreadPoolExecutor,
+) -> bool:
+    """Submits each finished query's upload, then waits for all of them."""
+    success = True
+    sheets: Optional[SheetsHandler] = None
+    uploads: Dict[str, Future] = {}
+    row_counts: Dict[str, int] = {}
+
+    for future in as_completed(futures):
+        spec = futures[future]
+        try:
+            df = future.result()
+        except Exception as e:
+            print(f"ERROR running {spec.name}: {e}")
+            success = False
+            continue
+
+        # execute_sql_to_dataframe returns a column-less frame on failure;
+        # a query that simply matched nothing still has its columns
+        if len(df.columns) == 0:
+            print(f"ERROR running {spec.name}: no result (see the error above)")
+            success = False
+            continue
+
+        print(f"   → {spec.name}: {len(df):,} rows")
+        count(f"rows.{spec.name}", len(df))
+        row_counts[spec.name] = len(df)
+
+        if sheets is None:
+            try:
+                with span("sheets.wait_ready"):
+                    sheets = sheets_future.result()
+            except Exception as e:
+                print(f"ERROR during upload: {e}")
+                return False
+        uploads[spec.name] = uploads_pool.submit(sheets.write_dataframe_to_sheet, df, spec.sheet_name)
+
+    for spec in futures.values():
+        if spec.name not in uploads:
+            continue
+        with span("upload.wait"):
+            uploaded = uploads[spec.name].result()
+        if uploaded:
+            print(f"SUCCESS: Uploaded {row_counts[spec.name]:,} rows from {spec.name} to '{spec.sheet_name}'")
+        else:
+            print(f"Upload failed for '{spec.sheet_name}' (SheetsHandler returned False)")
+            success = False
+
+    return success
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point: `python -m src.query_runner [query ...]`."""
+    specs = {spec.name: spec for spec in discover_queries()}
+
+    parser = argparse.ArgumentParser(description="Run the annotated queries in sql_query/ and upload each to its tab.")
+    parser.add_argument(
+        "queries",
+        nargs="*",
+        choices=sorted(specs) or None,
+        help="Queries to run (file names without .sql); default is all of them",
+    )
+    parser.add_argument("--list", action="store_true", help="List the annotated queries and exit")
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the local query result cache and fetch fresh rows",
+    )
+    args = parser.parse_args(argv)
+
+    if args.list or not specs:
+        for spec in specs.values():
+            top = f", top {spec.top}" if spec.top is not None else ""
+            print(f"{spec.name:<24} → '{spec.sheet_name}' ({spec.window or 'no window'}{top})")
+        if not specs:
+            print(f"No .sql files with a '-- tab:' header in {SQL_DIR}")
+        return
+
+    names = list(dict.fromkeys(args.queries)) or list(specs)
+    run_queries([specs[name] for name in names], refresh=args.refresh)
+
+
+if __name__ == "__main__":
+    main()
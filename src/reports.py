@@ -0,0 +1,91 @@
+# src/reports.py
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from .holidays import previous_business_day
+
+# A report window is a half-open [start, end) range of CompleteDate values
+Window = Tuple[datetime, datetime]
+
+# Report variants: the task rows plus an optional summary built from them, or
+# only the summary tab, aggregated by SQL Server (see sql_templates.rollup_query)
+DETAIL = "detail"
+AGGREGATED = "aggregated"
+VARIANTS = (DETAIL, AGGREGATED)
+
+
+def previous_business_day_window(now: Optional[datetime] = None) -> Window:
+    """Whole previous business day, midnight to midnight."""
+    if now is None:
+        now = datetime.now()
+
+    target_date = previous_business_day(now.date())
+    start_time = datetime.combine(target_date, time(0, 0))
+    return start_time, start_time + timedelta(days=1)
+
+
+def today_window(start: time, end: time) -> Callable[[Optional[datetime]], Window]:
+    """Builds a window function covering start → end on the day of the run."""
+
+    def window(now: Optional[datetime] = None) -> Window:
+        if now is None:
+            now = datetime.now()
+        today = now.date()
+        return datetime.combine(today, start), datetime.combine(today, end)
+
+    return window
+
+
+@dataclass(frozen=True)
+class ReportDefinition:
+    """One report tab: which rows it covers and where they are uploaded."""
+
+    name: str
+    sheet_name: str
+    window: Callable[[Optional[datetime]], Window]
+    label: str
+    # The daily tab has always stored CompleteDate as a plain date (no time)
+    date_only: bool = False
+    # Optional per-technician rollup tab (see aggregations.summarize_by_technician)
+    summary_sheet_name: Optional[str] = None
+    # AGGREGATED skips the raw rows tab and fetches only the summary, pre-aggregated
+    # on the server: one row per technician and hour instead of one per task
+    variant: str = DETAIL
+
+    def __post_init__(self):
+        if self.variant not in VARIANTS:
+            raise ValueError(f"{self.name}: unknown variant '{self.variant}' (expected one of {VARIANTS})")
+        if self.variant == AGGREGATED and not self.summary_sheet_name:
+            raise ValueError(f"{self.name}: the aggregated variant needs a summary_sheet_name")
+
+    @property
+    def main_tab(self) -> str:
+        """The tab this report is known by: its rows tab, or the summary tab when AGGREGATED."""
+        return self.summary_sheet_name if self.variant == AGGREGATED else self.sheet_name
+
+
+# --- Registry: add a report here instead of copying a main script ---
+REPORTS: Dict[str, ReportDefinition] = {
+    "daily": ReportDefinition(
+        name="daily",
+        sheet_name="MagicTouch A_EFF Tasks Report",
+        window=previous_business_day_window,
+        label="previous business day",
+        date_only=True,
+    ),
+    "midday": ReportDefinition(
+        name="midday",
+        sheet_name="12PM_MIDDAY_IMPORT",
+        window=today_window(time(3, 0), time(12, 0)),  # 3:00 AM – 12:00 PM
+        label="3 AM – noon",
+        summary_sheet_name="12PM_MIDDAY_SUMMARY",
+    ),
+    "midafternoon": ReportDefinition(
+        name="midafternoon",
+        sheet_name="3PM_MIDDAY_IMPORT",
+        window=today_window(time(3, 0), time(15, 0)),  # 3:00 AM – 3:00 PM
+        label="3 AM – 3 PM",
+        summary_sheet_name="3PM_MIDDAY_SUMMARY",
+    ),
+}
@@ -0,0 +1,205 @@
+# src/result_cache.py
+import hashlib
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Optional, Sequence
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from .config import get_env
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_CACHE_DIR = BASE_DIR.parent / ".cache" / "query_results"
+
+# Re-runs within this many seconds reuse the stored result instead of querying;
+# override with QUERY_CACHE_TTL_SECONDS / QUERY_CACHE_MAX_MB
+DEFAULT_TTL_SECONDS = 15 * 60
+DEFAULT_MAX_MB = 512
+
+
+def _param_text(value) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return repr(value)
+
+
+def cache_key(query: str, params: Optional[Sequence] = None) -> str:
+    """
+    SHA-256 of the SQL text plus every bound parameter (type and value).
+
+    For task_by_tech_eff.sql the parameters are the [start, end) window, so
+    each window gets its own entry.
+    """
+    digest = hashlib.sha256(query.encode("utf-8"))
+    for value in params or []:
+        digest.update(b"\0" + type(value).__name__.encode() + b"=" + _param_text(value).encode())
+    return digest.hexdigest()
+
+
+def _remove(path: Path):
+    """Deletes a cache file; on Windows a file still memory-mapped elsewhere is left for next time."""
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _plain_table(df: pd.DataFrame) -> pa.Table:
+    """
+    Arrow table for one chunk with categorical columns decoded to plain values.
+
+    Every chunk has its own categories, and an Arrow IPC file cannot change a
+    column's dictionary between batches; readers re-apply the categorical
+    dtypes (db_handler.apply_column_dtypes).
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, field in enumerate(table.schema):
+        if pa.types.is_dictionary(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+    return table
+
+
+class ResultWriter:
+    """
+    Streams DataFrame chunks into a temporary Arrow IPC file for one cache key.
+
+    Nothing becomes visible to readers until commit(); abort() (or any chunk
+    whose schema cannot be made to match the first one) discards the file.
+    """
+
+    def __init__(self, cache: "ResultCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.rows = 0
+        self._tmp_path = cache.path(key).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        self._writer = None
+        self._schema = None
+        self._failed = False
+
+    def write(self, df: pd.DataFrame):
+        if self._failed:
+            return
+        try:
+            table = _plain_table(df)
+            if self._writer is None:
+                self.cache.root.mkdir(parents=True, exist_ok=True)
+                self._schema = table.schema
+                # Uncompressed IPC file (= Feather v2), so reads can be memory-mapped
+                self._writer = pa.ipc.new_file(str(self._tmp_path), self._schema)
+            else:
+                table = table.cast(self._schema)
+            self._writer.write_table(table)
+            self.rows += len(df)
+        except (pa.ArrowException, OSError) as e:
+            print(f"⚠️ Result cache disabled for this query: {e}")
+            self.abort()
+            self._failed = True
+
+    def commit(self):
+        """Publishes the file under its key and trims the cache to size."""
+        if self._failed or self._writer is None:
+            return
+        self._writer.close()
+        self._writer = None
+        try:
+            os.replace(self._tmp_path, self.cache.path(self.key))
+        except OSError as e:
+            # e.g. the old entry is still memory-mapped by a reader on Windows
+            print(f"⚠️ Could not store query result in cache: {e}")
+            _remove(self._tmp_path)
+            return
+        self.cache.evict()
+
+    def abort(self):
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except pa.ArrowException:
+                pass
+            self._writer = None
+        _remove(self._tmp_path)
+
+
+class ResultCache:
+    """
+    On-disk cache of query results, one Arrow IPC (Feather v2) file per key.
+
+    - Entries older than `ttl_seconds` (by write time) are treated as missing.
+    - Reads are memory-mapped, so a hit costs no database round trip and
+      little more than the pages that are actually touched.
+    - The total size is kept under `max_bytes` by deleting the least recently
+      used entries; each hit stamps the file's access time.
+    """
+
+    def __init__(
+        self,
+        root: Path = DEFAULT_CACHE_DIR,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024,
+    ):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def path(self, key: str) -> Path:
+        return self.root / f"{key}.arrow"
+
+    def get(self, key: str) -> Optional[pa.Table]:
+        """Memory-mapped table for key, or None if missing or expired."""
+        path = self.path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+
+        now = time.time()
+        if now - stat.st_mtime > self.ttl_seconds:
+            _remove(path)
+            return None
+
+        # atime marks recency for LRU eviction; mtime keeps the write time for the TTL
+        os.utime(path, (now, stat.st_mtime))
+        return feather.read_table(str(path), memory_map=True)
+
+    def writer(self, key: str) -> ResultWriter:
+        return ResultWriter(self, key)
+
+    def evict(self):
+        """Drops expired entries, then least recently used ones until under max_bytes."""
+        with self._lock:
+            now = time.time()
+            entries = []
+            for path in self.root.glob("*.arrow"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                if now - stat.st_mtime > self.ttl_seconds:
+                    _remove(path)
+                else:
+                    entries.append((stat.st_atime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                _remove(path)
+                total -= size
+
+    def clear(self):
+        for path in self.root.glob("*.arrow"):
+            _remove(path)
+
+
+def default_cache() -> ResultCache:
+    return ResultCache(
+        ttl_seconds=float(get_env("QUERY_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+        max_bytes=int(float(get_env("QUERY_CACHE_MAX_MB", DEFAULT_MAX_MB)) * 1024 * 1024),
+    )
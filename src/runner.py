@@ -0,0 +1,562 @@
+# src/runner.py
+from __future__ import annotations
+
+import argparse
+import logging
+from concurrent.futures import Executor, Future
+from contextlib import nullcontext
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .freshness import RunState, probe_window, unchanged_since_last_run
+from .metrics import count, finish_run, span, start_run
+from .profiling import DEFAULT_TOP, PROFILE_MODES, RunProfiler, checkpoint, worker_pool
+from .reports import AGGREGATED, DETAIL, REPORTS, ReportDefinition, Window
+from .sql_templates import window_params
+
+# pandas, pyarrow, gspread and google-auth are imported inside the functions
+# that use them, so a run that stops at the freshness check never loads them
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .sheets_handler import SheetsHandler
+
+logger = logging.getLogger(__name__)
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+SQL_FILE_PATH = BASE_DIR.parent / "sql_query" / "task_by_tech_eff.sql"
+
+DATE_COL = 'CompleteDate'
+
+# Threads for Sheets work: one opens the spreadsheet while the query runs,
+# the rest upload finished reports while later ones are still being built
+SHEETS_WORKERS = 4
+
+
+def combined_window(windows: Sequence[Window]) -> Window:
+    """Smallest single [start, end) window that covers every report window."""
+    return min(w[0] for w in windows), max(w[1] for w in windows)
+
+
+@span("parse_dates")
+def parse_dates(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Makes CompleteDate datetime64 (one pass) and drops rows that fail to parse."""
+    from .dates import normalize_dates
+
+    return normalize_dates(chunk, DATE_COL)
+
+
+def prepare_rows(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Per-chunk transform: parse dates, then map technician names from the employee dimension."""
+    from .employees import attach_employee_names
+
+    chunk = parse_dates(chunk)
+    with span("employees.attach"):
+        return attach_employee_names(chunk)
+
+
+@span("split")
+def split_reports(chunk: pd.DataFrame, windows: Dict[str, Window]) -> Dict[str, pd.DataFrame]:
+    """Slices one parsed chunk into every report's window (views where possible)."""
+    from .dates import split_windows
+
+    return split_windows(chunk, windows, DATE_COL)
+
+
+def finish_report(report: ReportDefinition, report_df: pd.DataFrame) -> pd.DataFrame:
+    """Final per-report touches on the assembled rows (plain dates for the daily tab)."""
+    if not report.date_only:
+        return report_df
+
+    from .dates import plain_dates
+
+    with span("plain_dates"):
+        # Build a new frame rather than mutating the shared one
+        return report_df.assign(**{DATE_COL: plain_dates(report_df[DATE_COL])})
+
+
+def open_sheets() -> SheetsHandler:
+    """Authenticates and caches the spreadsheet/tab handles (no data needed)."""
+    from .sheets_handler import SheetsHandler
+
+    return SheetsHandler().prepare()
+
+
+def fetch_summary(report: ReportDefinition, window: Window, refresh: bool = False) -> pd.DataFrame:
+    """The report's summary tab from a server-side rollup of the task query (AGGREGATED variant)."""
+    from .aggregations import SUMMARY_GROUPING_SETS, summary_from_rollup
+    from .db_handler import execute_query_to_dataframe, get_result_cache, read_sql_query
+    from .employees import attach_employee_names
+    from .sql_templates import rollup_query
+
+    query = rollup_query(read_sql_query(str(SQL_FILE_PATH)), SUMMARY_GROUPING_SETS)
+    with span(f"query.{report.name}.rollup"):
+        rollup = execute_query_to_dataframe(
+            query, params=window_params(*window), cache=get_result_cache(), refresh=refresh
+        )
+    # A failed query comes back without columns; an empty window still has them
+    if len(rollup.columns) == 0:
+        raise RuntimeError(f"rollup query for '{report.name}' failed (see the error above)")
+
+    count(f"rows.{report.name}.rollup", len(rollup))
+    with span("employees.attach"):
+        rollup = attach_employee_names(rollup)
+    with span("summarize"):
+        return summary_from_rollup(rollup, window)
+
+
+def report_tabs(report: ReportDefinition, report_df: pd.DataFrame, window: Window) -> Dict[str, pd.DataFrame]:
+    """Every tab one report writes: its raw rows plus the optional summary."""
+    from .aggregations import summarize_by_technician
+
+    tabs = {report.sheet_name: report_df}
+    if report.summary_sheet_name:
+        with span("summarize"):
+            summary_df = summarize_by_technician(report_df, window)
+        tabs[report.summary_sheet_name] = summary_df
+        print(f"   → {report.name}: {len(summary_df):,} technicians summarized for '{report.summary_sheet_name}'")
+    return tabs
+
+
+def run_reports(
+    report_names: Sequence[str],
+    now: Optional[datetime] = None,
+    incremental: bool = False,
+    diff_write: bool = False,
+    refresh: bool = False,
+    sheets: Optional[SheetsHandler] = None,
+    append: bool = False,
+    aggregated: Sequence[str] = (),
+) -> bool:
+    """
+    Produces every requested report from a single query execution.
+
+    The query is run once over the union of the report windows; each report
+    is then sliced out of the same DataFrame and uploaded to its own tab.
+    Sheets authentication runs in the background during the query, and each
+    report is uploaded on its own thread as soon as it is built, so the run
+    takes roughly max(DB, Sheets) rather than their sum.
+
+    Stage timings and counters are appended to the metrics file (see metrics.py).
+
+    With incremental=True only rows newer than the local TaskStore's
+    high-water mark are fetched, and the reports are read from the store.
+    Incremental runs first probe COUNT/MAX(CompleteDate) for the window and
+    stop before loading pandas/gspread if nothing changed since the last upload.
+    With diff_write=True each tab only receives the cells that changed.
+    Results of a full fetch are kept in the local result cache for a while, so
+    re-running the same reports skips the database; refresh=True forces a new fetch.
+    Tabs whose content fingerprint matches their last upload are not rewritten
+    (refresh=True uploads them anyway).
+    With append=True the intraday tabs only receive the rows completed since
+    their last upload (see append_state.py); they are rewritten in full on a
+    new day, every RECONCILE_EVERY runs, or when older rows changed.
+    A long-lived caller (the scheduler) passes its already-authenticated
+    `sheets` handler; its tab list is reloaded instead of opening a new one.
+    Reports named in `aggregated` (or registered with variant=AGGREGATED)
+    only write their summary tab, from a rollup SQL Server computes; they
+    are left out of the detail query's window.
+
+    Returns:
+        bool: True if every requested tab was uploaded, False otherwise
+    """
+    if now is None:
+        now = datetime.now()
+
+    reports: List[ReportDefinition] = [
+        replace(REPORTS[name], variant=AGGREGATED) if name in aggregated else REPORTS[name]
+        for name in report_names
+    ]
+    start_run(reports=",".join(r.name for r in reports), incremental=incremental, refresh=refresh)
+    windows: Dict[str, Window] = {r.name: r.window(now) for r in reports}
+
+    print(f"Run started at {now:%Y-%m-%d %H:%M:%S} for: {', '.join(r.name for r in reports)}")
+    for r in reports:
+        start_time, end_time = windows[r.name]
+        print(f"   → {r.name}: {r.label} ({start_time:%Y-%m-%d %I:%M %p} – {end_time:%Y-%m-%d %I:%M %p})"
+              f" → '{r.main_tab}'" + (" (aggregated on the server)" if r.variant == AGGREGATED else ""))
+
+    # Google auth + spreadsheet/tab lookup don't depend on the query result,
+    # so they run on the pool while the database is busy
+    success = False
+    try:
+        fingerprint = None
+        if incremental and not refresh:
+            unchanged, fingerprint = _probe_unchanged(report_names, combined_window(list(windows.values())))
+            if unchanged:
+                print("\nNo new or changed rows since the last upload; the tabs are already current.")
+                count("runs.unchanged")
+                success = True
+                return success
+
+        with worker_pool(max_workers=SHEETS_WORKERS, thread_name_prefix="sheets") as pool:
+            if sheets is not None:
+                sheets_future: Future = pool.submit(sheets.prepare, True)
+            else:
+                sheets_future = pool.submit(open_sheets)
+            success = _run_pipeline(pool, sheets_future, reports, windows, incremental, diff_write, refresh, append)
+
+        if success and fingerprint is not None:
+            RunState().record(report_names, fingerprint)
+    finally:
+        finish_run(success)
+
+    print(f"\nRun finished at {datetime.now():%H:%M:%S}\n")
+    return success
+
+
+def upload_tabs(
+    sheets: SheetsHandler,
+    tabs: Dict[str, pd.DataFrame],
+    diff_write: bool,
+    fingerprints: Dict[str, str],
+    use_metadata: bool,
+    appends: Optional[Dict[str, pd.DataFrame]] = None,
+    seeds: Optional[Dict[str, Tuple[str, int]]] = None,
+) -> bool:
+    """
+    Uploads one report's tabs and, if enabled, stamps their fingerprints into the sheet.
+
+    Tabs in `appends` only get those new rows appended; tabs also in `seeds`
+    ({tab: (source tab, rows)}) first get that many rows copied over from the
+    source tab. If a copy or append fails (e.g. the tab was deleted) the tab
+    is rewritten in full and dropped from `appends`, so the caller records it
+    as a full upload.
+    """
+    from .fingerprints import METADATA_KEY
+
+    appends = {} if appends is None else appends
+    seeds = seeds or {}
+    rewrite = {name: df for name, df in tabs.items() if name not in appends}
+    for name in list(appends):
+        done = True
+        if name in seeds:
+            source, rows = seeds[name]
+            done = sheets.copy_tab_values(source, name, rows + 1, len(tabs[name].columns))
+        if done and len(appends[name]):
+            done = sheets.append_dataframe_to_sheet(appends[name], name)
+        if not done:
+            rewrite[name] = tabs[name]
+            del appends[name]
+
+    if rewrite and not sheets.write_dataframes_to_sheets(rewrite, diff=diff_write):
+        return False
+    if use_metadata:
+        # A missing stamp only costs one extra upload next time
+        sheets.write_tab_metadata(METADATA_KEY, fingerprints)
+    return True
+
+
+def _probe_unchanged(report_names: Sequence[str], window: Window) -> Tuple[bool, Optional[dict]]:
+    """(unchanged since the last upload?, current fingerprint) — never fails the run."""
+    try:
+        with span("freshness.probe"):
+            fingerprint = probe_window(str(SQL_FILE_PATH), window)
+    except Exception as e:
+        # Warning level (stderr even without logging configured) plus a counter,
+        # so a probe that always fails can't silently disable the early exit
+        logger.warning("⚠️ Freshness check failed (%s); running the full update.", e)
+        count("freshness.probe_failures")
+        return False, None
+
+    return unchanged_since_last_run(RunState().last_fingerprint(report_names), fingerprint), fingerprint
+
+
+def _fetch_detail(
+    reports: List[ReportDefinition],
+    windows: Dict[str, Window],
+    incremental: bool,
+    refresh: bool,
+) -> Optional[Dict[str, List[pd.DataFrame]]]:
+    """
+    Runs the query once over the combined window and slices every report out
+    of each chunk as it streams in. Returns each report's parts, or None if
+    the fetch failed or returned nothing.
+    """
+    from .db_handler import get_result_cache, iter_sql_dataframes
+    from .task_store import TaskStore
+
+    start_time, end_time = combined_window(list(windows.values()))
+    print(f"\nStep 1: Loading SQL from: {SQL_FILE_PATH}")
+
+    report_parts: Dict[str, List[pd.DataFrame]] = {r.name: [] for r in reports}
+    total_rows = 0
+
+    try:
+        if incremental:
+            store = TaskStore()
+            with span("task_store.sync"):
+                synced = store.sync(str(SQL_FILE_PATH), start_time, end_time)
+            if not synced:
+                return None
+            chunks = iter([prepare_rows(store.load(start_time, end_time))])
+        else:
+            chunks = iter_sql_dataframes(
+                str(SQL_FILE_PATH),
+                params=window_params(start_time, end_time),
+                transform=prepare_rows,
+                cache=get_result_cache(),
+                refresh=refresh,
+            )
+
+        for chunk in chunks:
+            total_rows += len(chunk)
+            for name, part in split_reports(chunk, windows).items():
+                report_parts[name].append(part)
+
+    except Exception as e:
+        print(f"ERROR loading data: {e}")
+        return None
+
+    if not report_parts[reports[0].name]:
+        print("No data returned.")
+        return None
+
+    print(f"Query successful → {total_rows:,} total rows retrieved")
+    return report_parts
+
+
+def _run_pipeline(
+    pool: Executor,
+    sheets_future: Future,
+    reports: List[ReportDefinition],
+    windows: Dict[str, Window],
+    incremental: bool,
+    diff_write: bool,
+    refresh: bool,
+    append: bool = False,
+) -> bool:
+    """Query → split → upload, submitting each report's upload as soon as it is built."""
+    from .append_state import AppendState, rows_to_append
+    from .db_handler import concat_frames
+    from .employees import get_employee_names
+    from .fingerprints import METADATA_KEY, TabFingerprints, frame_fingerprint, metadata_enabled
+
+    # ================================================================
+    # Step 1 + 2: Run the query once over the combined window of the detail
+    # reports; aggregated reports only need their (small) rollup query,
+    # which runs on the pool alongside it
+    # ================================================================
+    detail = [r for r in reports if r.variant == DETAIL]
+    summaries: Dict[str, Future] = {
+        r.name: pool.submit(fetch_summary, r, windows[r.name], refresh) for r in reports if r.variant == AGGREGATED
+    }
+
+    # The employee dimension (cached for a day) loads on the pool while the
+    # query runs; prepare_rows waits for it on the first chunk
+    pool.submit(get_employee_names)
+
+    report_parts: Dict[str, List[pd.DataFrame]] = {}
+    if detail:
+        report_parts = _fetch_detail(detail, {r.name: windows[r.name] for r in detail}, incremental, refresh)
+        if report_parts is None:
+            return False
+    # Rows are parsed chunk by chunk as they stream in, so this boundary covers both
+    checkpoint("fetch")
+
+    # ================================================================
+    # Step 2 + 3: Build each report and hand it to an upload thread right
+    # away, so earlier tabs upload while later windows are still computed
+    # ================================================================
+    print("\nStep 2: Splitting rows into report windows and uploading to Google Sheets...")
+
+    try:
+        with span("sheets.wait_ready"):
+            sheets: SheetsHandler = sheets_future.result()
+    except Exception as e:
+        print(f"ERROR during upload: {e}")
+        return False
+
+    # Tabs whose content matches their last successful upload are not rewritten
+    # (--refresh uploads everything); with SHEETS_FINGERPRINT_METADATA the
+    # fingerprints kept in the sheet itself are authoritative
+    stored = TabFingerprints()
+    use_metadata = metadata_enabled()
+    remote = sheets.read_tab_metadata(METADATA_KEY) if use_metadata else {}
+    append_state = AppendState() if append else None
+
+    uploads: Dict[str, Future] = {}
+    pending: Dict[str, Dict[str, str]] = {}
+    row_counts: Dict[str, int] = {}
+    report_frames: Dict[str, pd.DataFrame] = {}
+    appends: Dict[str, Dict[str, pd.DataFrame]] = {}
+    seeds: Dict[str, Dict[str, Tuple[str, dict]]] = {}
+    # Tabs this run writes cannot seed another tab: they may change mid-copy
+    written = {r.sheet_name for r in reports}
+    failed: List[str] = []
+    for r in reports:
+        if r.variant == AGGREGATED:
+            try:
+                with span("summary.wait"):
+                    summary_df = summaries[r.name].result()
+            except Exception as e:
+                print(f"ERROR building the {r.name} summary: {e}")
+                failed.append(r.name)
+                continue
+            print(f"   → {r.name}: {len(summary_df):,} technicians summarized by SQL Server"
+                  f" for '{r.summary_sheet_name}' ({r.label})")
+            report_df = summary_df
+            tabs = {r.summary_sheet_name: summary_df}
+        else:
+            with span("concat"):
+                report_df = concat_frames(report_parts.pop(r.name))
+            report_df = finish_report(r, report_df)
+            print(f"   → {r.name}: {len(report_df):,} rows ({r.label})")
+            count(f"rows.{r.name}", len(report_df))
+            row_counts[r.name] = len(report_df)
+            tabs = report_tabs(r, report_df, windows[r.name])
+
+        with span("fingerprint"):
+            fingerprints = {name: frame_fingerprint(df) for name, df in tabs.items()}
+
+        if not refresh:
+            for name in list(tabs):
+                last = remote.get(name) if use_metadata else stored.get(name)
+                if fingerprints[name] == last:
+                    print(f"   → '{name}' unchanged since the last upload; skipped")
+                    count("sheets.tabs_skipped")
+                    del tabs[name]
+
+        appends[r.name], seeds[r.name] = {}, {}
+        if append_state is not None and not r.date_only and r.sheet_name in tabs:
+            report_frames[r.name] = report_df
+            if not refresh:
+                start = windows[r.name][0]
+                new_rows = rows_to_append(append_state.get(r.sheet_name), report_df, start)
+                # No new rows but a changed fingerprint means older rows were edited: rewrite
+                if new_rows is not None and len(new_rows):
+                    appends[r.name][r.sheet_name] = new_rows
+                elif new_rows is None:
+                    # The tab's last upload was an earlier window: start from a tab
+                    # already holding part of this one (the 12PM tab for the 3PM tab)
+                    seed = append_state.seed_for(r.sheet_name, start, report_df.columns, exclude=written)
+                    new_rows = rows_to_append(seed[1], report_df, start) if seed else None
+                    if new_rows is not None:
+                        appends[r.name][r.sheet_name] = new_rows
+                        seeds[r.name][r.sheet_name] = seed
+
+        if tabs:
+            # Each report's changed tabs (raw rows plus summary) go out in one batch update
+            pending[r.name] = {name: fingerprints[name] for name in tabs}
+            copies = {name: (tab, entry["rows"]) for name, (tab, entry) in seeds[r.name].items()}
+            uploads[r.name] = pool.submit(
+                upload_tabs, sheets, tabs, diff_write, pending[r.name], use_metadata, appends[r.name], copies
+            )
+
+    checkpoint("filter")
+    success = not failed
+    for r in reports:
+        if r.name in failed:
+            continue
+        if r.name not in uploads:
+            print(f"UNCHANGED: '{r.main_tab}' ({r.label}) is already up to date")
+            continue
+
+        with span("upload.wait"):
+            uploaded = uploads[r.name].result()
+        if uploaded:
+            stored.record(pending[r.name])
+            appended = appends[r.name].get(r.sheet_name)
+            seed = seeds[r.name].get(r.sheet_name) if appended is not None else None
+            if r.name in report_frames:
+                append_state.record(
+                    r.sheet_name, windows[r.name][0], report_frames[r.name], appended, seed[1] if seed else None
+                )
+            for name in pending[r.name]:
+                if name == r.sheet_name and appended is not None:
+                    seeded = f" after the rows of '{seed[0]}'" if seed else ""
+                    print(f"SUCCESS: Appended {len(appended):,} new rows ({r.label}) to '{name}'{seeded}"
+                          f" ({row_counts[r.name]:,} in total)")
+                    count("sheets.rows_appended", len(appended))
+                elif name == r.sheet_name:
+                    print(f"SUCCESS: Uploaded {row_counts[r.name]:,} rows ({r.label}) to '{name}'")
+                else:
+                    print(f"SUCCESS: Uploaded summary ({r.label}) to '{name}'")
+        else:
+            print(f"Upload failed for '{r.main_tab}' (SheetsHandler returned False)")
+            success = False
+
+    checkpoint("upload")
+    return success
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point: `python -m src.runner daily midday midafternoon`."""
+    parser = argparse.ArgumentParser(description="Upload technician efficiency reports to Google Sheets.")
+    parser.add_argument(
+        "reports",
+        nargs="+",
+        choices=sorted(REPORTS),
+        help="Reports to produce from a single query run",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch rows newer than the local task store's high-water mark "
+             "(and exit early if nothing changed since the last upload)",
+    )
+    parser.add_argument(
+        "--diff-write",
+        action="store_true",
+        help="Only send changed cells to each tab instead of clearing and rewriting it",
+    )
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Only append rows completed since the last run to the intraday tabs "
+             "(each tab is still rewritten in full on a new day and every few runs)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Ignore the local query result cache and content fingerprints: "
+             "fetch fresh rows and rewrite every tab",
+    )
+    parser.add_argument(
+        "--aggregated",
+        action="append",
+        default=[],
+        metavar="REPORT",
+        choices=sorted(name for name, r in REPORTS.items() if r.summary_sheet_name),
+        help="Only write this report's summary tab, aggregated by SQL Server instead of "
+             "from the task rows (repeatable)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="cpu",
+        choices=PROFILE_MODES,
+        help="Profile the run: cpu (cProfile, the default) or memory (tracemalloc snapshots "
+             "at each stage boundary); artifacts go to .cache/profiles/",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP,
+        metavar="N",
+        help="Functions / source lines listed in the printed profile summary",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep order, drop duplicates
+    report_names = list(dict.fromkeys(args.reports))
+    profiler = (
+        RunProfiler(args.profile, label="-".join(report_names), top=args.profile_top)
+        if args.profile else nullcontext()
+    )
+    with profiler:
+        run_reports(
+            report_names,
+            incremental=args.incremental,
+            diff_write=args.diff_write,
+            refresh=args.refresh,
+            append=args.append,
+            aggregated=args.aggregated,
+        )
+
+
+if __name__ == "__main__":
+    main()
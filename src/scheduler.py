@@ -0,0 +1,289 @@
+# src/scheduler.py
+"""
+Long-lived replacement for the three run_server_*.bat launchers.
+
+One process runs the daily, 12 PM and 3 PM reports on business days
+(src/holidays.py). It keeps its Sheets client and pooled database
+connection between runs, so a run only pays for the query and the
+upload, not for interpreter startup, imports, DB login and Google OAuth.
+Shortly before each run the OAuth token is refreshed if it is about to
+expire, and a pooled connection is checked out so the login happens
+ahead of time. Every run is appended to .cache/scheduler/history.jsonl.
+
+Run from the project root (see run_server_scheduler.bat):
+    uv run python -m src.scheduler
+    uv run python -m src.scheduler --at midday=12:05 --run-now daily
+    uv run python -m src.scheduler --show
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import threading
+import time as clock
+from dataclasses import dataclass, replace
+from datetime import datetime, time, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
+
+from .holidays import get_business_calendar
+from .reports import REPORTS
+
+if TYPE_CHECKING:
+    from .sheets_handler import SheetsHandler
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_HISTORY_PATH = BASE_DIR.parent / ".cache" / "scheduler" / "history.jsonl"
+
+# Warm the token and a DB connection this long before each run
+WARMUP_LEAD = timedelta(seconds=60)
+
+# Never sleep longer than this in one go, so a suspended machine or a
+# clock change is noticed within a minute
+MAX_SLEEP_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    """One report set, run once at `at` on every business day."""
+
+    name: str
+    reports: Tuple[str, ...]
+    at: time
+
+
+# --- The runs the .bat launchers used to start ---
+DEFAULT_SCHEDULE: List[ScheduledJob] = [
+    ScheduledJob(name="daily", reports=("daily",), at=time(6, 0)),
+    ScheduledJob(name="midday", reports=("midday",), at=time(12, 0)),
+    ScheduledJob(name="midafternoon", reports=("midafternoon",), at=time(15, 0)),
+]
+
+
+def next_run(job: ScheduledJob, after: datetime) -> datetime:
+    """First business-day occurrence of job.at strictly after `after`."""
+    calendar = get_business_calendar()
+    day = after.date()
+    if not (calendar.is_business_day(day) and datetime.combine(day, job.at) > after):
+        day = calendar.next_business_day(day)
+    return datetime.combine(day, job.at)
+
+
+class RunHistory:
+    """Append-only JSON-lines log of scheduled runs."""
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH):
+        self.path = Path(path)
+
+    def append(self, entry: dict):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+        except OSError as e:
+            print(f"⚠️ Could not write run history: {e}")
+
+    def last(self, n: int = 10) -> List[dict]:
+        try:
+            with open(self.path, "r") as f:
+                lines = f.readlines()[-n:]
+        except FileNotFoundError:
+            return []
+        return [json.loads(line) for line in lines if line.strip()]
+
+
+class Scheduler:
+    """
+    Sleeps until the next due job, warms the clients, then runs it.
+
+    Jobs run one after another on the scheduler thread. A run that raises is
+    logged and the loop carries on with the next job; a run that is missed
+    (machine asleep, process started late) is not caught up.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[ScheduledJob] = DEFAULT_SCHEDULE,
+        history: Optional[RunHistory] = None,
+        incremental: bool = False,
+        diff_write: bool = False,
+        append: bool = False,
+    ):
+        self.jobs = list(jobs)
+        self.history = history or RunHistory()
+        self.incremental = incremental
+        self.diff_write = diff_write
+        self.append = append
+        self._sheets: Optional[SheetsHandler] = None
+        self._stop = threading.Event()
+
+    # ---------------------------------------------------------------
+    # Warm clients
+    # ---------------------------------------------------------------
+    def warm_up(self):
+        """Imports the pipeline, authenticates Sheets and opens a DB connection."""
+        from . import db_handler  # noqa: F401 (pays the pandas/pyarrow import once)
+        from .db_pool import get_pool
+        from .sheets_handler import SheetsHandler
+
+        started = clock.perf_counter()
+        try:
+            if self._sheets is None:
+                self._sheets = SheetsHandler().prepare()
+            else:
+                self._sheets.refresh_credentials()
+        except Exception as e:
+            # The next run authenticates again through run_reports
+            print(f"⚠️ Sheets warm-up failed: {e}")
+            self._sheets = None
+
+        try:
+            # Checks out (health-checking or reconnecting) a pooled connection
+            with get_pool().connection():
+                pass
+        except Exception as e:
+            print(f"⚠️ Database warm-up failed: {e}")
+
+        print(f"Clients warm ({clock.perf_counter() - started:.2f}s)")
+
+    # ---------------------------------------------------------------
+    # Running
+    # ---------------------------------------------------------------
+    def run_job(self, job: ScheduledJob, scheduled_for: Optional[datetime] = None) -> bool:
+        """Runs one job now and appends it to the history."""
+        from .runner import run_reports
+
+        started_at = datetime.now()
+        started = clock.perf_counter()
+        success, error = False, None
+        try:
+            success = run_reports(
+                list(job.reports),
+                now=started_at,
+                incremental=self.incremental,
+                diff_write=self.diff_write,
+                sheets=self._sheets,
+                append=self.append,
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"🚨 ERROR in scheduled run '{job.name}': {error}")
+
+        self.history.append({
+            "job": job.name,
+            "reports": list(job.reports),
+            "scheduled_for": (scheduled_for or started_at).isoformat(timespec="seconds"),
+            "started_at": started_at.isoformat(timespec="seconds"),
+            "duration_s": round(clock.perf_counter() - started, 3),
+            "success": success,
+            "error": error,
+        })
+        return success
+
+    def next_due(self, after: datetime) -> Tuple[datetime, List[ScheduledJob]]:
+        """The next run time and every job scheduled at it."""
+        due: Dict[datetime, List[ScheduledJob]] = {}
+        for job in self.jobs:
+            due.setdefault(next_run(job, after), []).append(job)
+        when = min(due)
+        return when, due[when]
+
+    def _sleep_until(self, when: datetime) -> bool:
+        """Sleeps in short steps until `when`; False if stop() was called."""
+        while not self._stop.is_set():
+            remaining = (when - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return True
+            self._stop.wait(min(remaining, MAX_SLEEP_SECONDS))
+        return False
+
+    def stop(self):
+        self._stop.set()
+
+    def serve_forever(self):
+        """Runs the schedule until stop() or Ctrl+C."""
+        self.warm_up()
+        last_due = datetime.now()
+        while not self._stop.is_set():
+            when, jobs = self.next_due(last_due)
+            print(f"Next run: {', '.join(j.name for j in jobs)} at {when:%a %Y-%m-%d %H:%M}")
+
+            if not self._sleep_until(when - WARMUP_LEAD):
+                break
+            self.warm_up()
+            if not self._sleep_until(when):
+                break
+
+            for job in jobs:
+                self.run_job(job, scheduled_for=when)
+            last_due = when
+
+
+def parse_overrides(values: Sequence[str], jobs: Sequence[ScheduledJob]) -> List[ScheduledJob]:
+    """Applies `name=HH:MM` time overrides to the schedule."""
+    by_name = {job.name: job for job in jobs}
+    for value in values:
+        name, _, at = value.partition("=")
+        if name not in by_name:
+            raise ValueError(f"Unknown job '{name}' (expected one of {sorted(by_name)})")
+        by_name[name] = replace(by_name[name], at=datetime.strptime(at, "%H:%M").time())
+    return list(by_name.values())
+
+
+def main(argv: Optional[Sequence[str]] = None):
+    """Command-line entry point: `python -m src.scheduler`."""
+    parser = argparse.ArgumentParser(description="Run the report schedule in one long-lived process.")
+    parser.add_argument(
+        "--at",
+        action="append",
+        default=[],
+        metavar="JOB=HH:MM",
+        help="Change a job's time (e.g. --at daily=06:30); may be repeated",
+    )
+    parser.add_argument(
+        "--run-now",
+        action="append",
+        default=[],
+        choices=[job.name for job in DEFAULT_SCHEDULE],
+        help="Run this job once at startup, then follow the schedule",
+    )
+    parser.add_argument("--incremental", action="store_true", help="Pass --incremental to every run")
+    parser.add_argument("--diff-write", action="store_true", help="Pass --diff-write to every run")
+    parser.add_argument("--append", action="store_true", help="Pass --append to every run")
+    parser.add_argument("--show", action="store_true", help="Print the schedule and recent runs, then exit")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = parse_overrides(args.at, DEFAULT_SCHEDULE)
+    except ValueError as e:
+        parser.error(str(e))
+    for job in jobs:
+        unknown = [name for name in job.reports if name not in REPORTS]
+        if unknown:
+            parser.error(f"Job '{job.name}' refers to unknown reports: {unknown}")
+
+    scheduler = Scheduler(jobs, incremental=args.incremental, diff_write=args.diff_write, append=args.append)
+
+    if args.show:
+        now = datetime.now()
+        for job in jobs:
+            print(f"{job.name:<14} {job.at:%H:%M}  next {next_run(job, now):%a %Y-%m-%d %H:%M}")
+        for entry in scheduler.history.last():
+            status = "OK  " if entry["success"] else "FAIL"
+            print(f"{status} {entry['started_at']} {entry['job']:<14} {entry['duration_s']:.1f}s")
+        return
+
+    try:
+        if args.run_now:
+            scheduler.warm_up()
+            for job in jobs:
+                if job.name in args.run_now:
+                    scheduler.run_job(job)
+        scheduler.serve_forever()
+    except KeyboardInterrupt:
+        print("\nScheduler stopped.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# src/sheets_client.py
+import json
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+import requests
+from gspread.exceptions import APIError
+from gspread.http_client import HTTPClient
+
+from .config import get_env
+from .metrics import count
+
+# Statuses worth retrying: quota exceeded and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Google Sheets API default quota is 60 requests per minute per user;
+# override with SHEETS_REQUESTS_PER_MINUTE if the project has more.
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_MAX_RETRIES = 6
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """HTTP status behind a gspread/requests error, or None if there was no response."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _idempotent(method: Optional[str], endpoint: Optional[str]) -> bool:
+    """Whether a request can be resent after the server may have applied it; values:append adds its rows again."""
+    return not (str(method).upper() == "POST" and str(endpoint).endswith(":append"))
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Seconds from a Retry-After header, if the server sent one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second, holding at most `capacity`.
+
+    acquire() blocks until a token is available, so callers never exceed the
+    configured sustained rate while still allowing short bursts.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Runs Sheets API calls under a token-bucket rate limit, a cap on concurrent
+    in-flight requests, and exponential backoff with jitter on retryable errors.
+
+    The clock, sleep and random source are injectable so the behaviour can be
+    exercised against a local fake server without real waiting.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        base_delay: float = 1.0,
+        max_delay: float = 64.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        rate = requests_per_minute / 60.0
+        # Allow a burst of up to ~10 seconds' worth of quota
+        self.bucket = TokenBucket(rate, capacity=max(1.0, rate * 10), clock=clock, sleep=sleep)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._in_flight = threading.BoundedSemaphore(max_in_flight)
+        self._sleep = sleep
+        self._rng = rng
+
+        # Counters for reporting
+        self.requests = 0
+        self.retries = 0
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        # Random extra of up to 1s so parallel clients don't retry in lockstep
+        return delay + self._rng()
+
+    def call(self, func: Callable, *args, idempotent: bool = True, **kwargs):
+        """
+        Calls func(*args, **kwargs), retrying retryable failures with backoff.
+
+        A non-idempotent call is only retried when it certainly was not
+        applied: a 429 (rejected by the quota) or a connect timeout. A read
+        timeout, a dropped connection or a 5xx may come after the server has
+        done the work, so those are raised for the caller to recover from.
+        """
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            try:
+                with self._in_flight:
+                    self.requests += 1
+                    count("sheets.api_calls")
+                    return func(*args, **kwargs)
+
+            except (APIError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                status = _status_code(e)
+                if isinstance(e, APIError):
+                    retryable = status in RETRYABLE_STATUSES if idempotent else status == 429
+                else:
+                    retryable = idempotent or isinstance(e, requests.exceptions.ConnectTimeout)
+                if not retryable or attempt >= self.max_retries:
+                    raise
+
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                self.retries += 1
+                count("sheets.retries")
+                print(f"⚠️ Sheets API {status or type(e).__name__}; retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                self._sleep(delay)
+
+
+def _default_scheduler() -> RequestScheduler:
+    return RequestScheduler(
+        requests_per_minute=float(get_env("SHEETS_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+        max_in_flight=int(get_env("SHEETS_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+    )
+
+
+class RateLimitedHTTPClient(HTTPClient):
+    """
+    gspread HTTP client whose every request goes through a shared RequestScheduler.
+
+    Pass the class to gspread.authorize(creds, http_client=RateLimitedHTTPClient).
+    All clients in the process share one scheduler, so the quota is respected
+    across handlers and threads.
+    """
+
+    scheduler: RequestScheduler = None
+    _scheduler_lock = threading.Lock()
+
+    @classmethod
+    def get_scheduler(cls) -> RequestScheduler:
+        with cls._scheduler_lock:
+            if cls.scheduler is None:
+                cls.scheduler = _default_scheduler()
+            return cls.scheduler
+
+    def request(self, *args, **kwargs):
+        body = kwargs.get("json")
+        if body is not None:
+            # Same serialization requests uses, so this is the payload size on the wire
+            count("sheets.bytes_sent", len(json.dumps(body).encode("utf-8")))
+        method = kwargs.get("method", args[0] if args else None)
+        endpoint = kwargs.get("endpoint", args[1] if len(args) > 1 else None)
+        return self.get_scheduler().call(super().request, *args, idempotent=_idempotent(method, endpoint), **kwargs)
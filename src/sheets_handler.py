@@ -1,13 +1,165 @@
+import math
 import os
-import json # Added import for JSON handling
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from numbers import Real
+import numpy as np
 import pandas as pd
-from google.oauth2.service_account import Credentials
 import gspread
-from gspread_dataframe import set_with_dataframe
-from dotenv import load_dotenv
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from .config import get_env, google_service_account_info
+from .metrics import count, span
+from .profiling import checkpoint
+from .sheets_client import RateLimitedHTTPClient
+
+# google.oauth2 and gspread_dataframe are imported where they are used, so
+# runs that never authenticate or call set_with_dataframe skip loading them
+
+
+def _cell_value(value):
+    """Value to send for one DataFrame cell (same rules as gspread_dataframe)."""
+    if value is None or (not isinstance(value, (list, tuple)) and pd.isnull(value)):
+        return ""
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, Real):
+        return value
+    return str(value)
+
+
+# Diff reads skip the sheet's display formatting: numbers come back as
+# numbers and dates / times as serial day numbers
+UNFORMATTED_READ = {"valueRenderOption": "UNFORMATTED_VALUE", "dateTimeRenderOption": "SERIAL_NUMBER"}
+
+# Day 0 of Sheets' serial date numbers
+_SHEETS_EPOCH = datetime(1899, 12, 30)
+
+# Text that USER_ENTERED parses into a number, a date(-time) or a time of day
+_NUMBER_TEXT = re.compile(r"[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?")
+_DATE_TEXT = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?")
+_TIME_TEXT = re.compile(r"(\d{1,2})(?::(\d{2})(?::(\d{2}))?)?\s*([AaPp][Mm])")
+
+
+def _entered_value(value):
+    """
+    What Sheets stores for a value sent with USER_ENTERED, in the form an
+    UNFORMATTED_READ returns it: numbers as floats, TRUE/FALSE as booleans,
+    dates and times (CompleteDate, "3 AM" summary headers) as serial day
+    numbers, anything else as the text itself.
+    """
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, Real):
+        return float(value)
+
+    text = str(value).strip()
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
+    if _NUMBER_TEXT.fullmatch(text):
+        return float(text)
+    if _DATE_TEXT.fullmatch(text):
+        try:
+            return (datetime.fromisoformat(text) - _SHEETS_EPOCH) / timedelta(days=1)
+        except ValueError:
+            # Shaped like a date but not one (month 13): Sheets keeps the text
+            return str(value)
+    time_match = _TIME_TEXT.fullmatch(text)
+    if time_match:
+        hour, minute, second, half = time_match.groups()
+        hour = int(hour) % 12 + (12 if half.upper() == "PM" else 0)
+        return (hour * 3600 + int(minute or 0) * 60 + int(second or 0)) / 86400
+    return str(value)
+
+
+def _same_cell(new_value, old_value) -> bool:
+    """Whether writing new_value would leave a cell that currently reads old_value unchanged."""
+    stored = _entered_value(new_value)
+    if isinstance(stored, bool) or isinstance(old_value, bool):
+        return stored is old_value
+    if isinstance(stored, float) and isinstance(old_value, Real):
+        # Serial dates carry milliseconds in the last few digits; allow only rounding noise
+        return math.isclose(stored, old_value, rel_tol=1e-14)
+    return stored == old_value
+
+
+def _column_cells(column: pd.Series) -> list:
+    """One column's cell values, converted per distinct value where the dtype allows."""
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Convert each category once; code -1 (missing) picks the trailing ""
+        cells = np.array([_cell_value(v) for v in column.cat.categories] + [""], dtype=object)
+        return cells[column.cat.codes.to_numpy()].tolist()
+    if isinstance(column.dtype, np.dtype) and column.dtype.kind in "biuf":
+        # tolist() already yields Python numbers; only NaN needs replacing
+        return ["" if v != v else v for v in column.to_numpy().tolist()]
+    if column.dtype == object:
+        # Text and plain-date columns repeat heavily (case numbers, one date per day)
+        codes, uniques = pd.factorize(column)
+        cells = np.array([_cell_value(v) for v in uniques] + [""], dtype=object)
+        return cells[codes].tolist()
+    return [_cell_value(v) for v in column.to_numpy(dtype=object)]
+
+
+def _dataframe_to_values(df: pd.DataFrame) -> list:
+    """Header row plus data rows, ready for a values update."""
+    values = [[_cell_value(col) for col in df.columns]]
+    columns = [_column_cells(df.iloc[:, i]) for i in range(df.shape[1])]
+    values.extend(map(list, zip(*columns)))
+    return values
+
+
+def _diff_ranges(old_values: list, new_values: list) -> list:
+    """
+    Compares the sheet's current values (read with UNFORMATTED_READ) with the
+    new ones, as Sheets will store them, and returns the minimal set of {'range', 'values'} blocks for one batch_update.
+
+    Each row contributes the span between its first and last changed cell;
+    consecutive rows with the same span are merged into one block. Cells
+    that exist in the sheet but not in the new data are blanked.
+    """
+    width = max([len(r) for r in new_values] + [len(r) for r in old_values] + [0])
+    height = max(len(new_values), len(old_values))
+
+    blocks = []
+    current = None  # [first_row, first_col, last_col, rows]
+
+    for i in range(height):
+        new_row = new_values[i] if i < len(new_values) else []
+        old_row = old_values[i] if i < len(old_values) else []
+
+        changed = [
+            j for j in range(width)
+            if not _same_cell(new_row[j] if j < len(new_row) else "", old_row[j] if j < len(old_row) else "")
+        ]
+
+        if not changed:
+            current = None
+            continue
+
+        first_col, last_col = changed[0], changed[-1]
+        span = [new_row[j] if j < len(new_row) else "" for j in range(first_col, last_col + 1)]
+
+        if (
+            current is not None
+            and current[0] + len(current[3]) == i
+            and current[1] == first_col
+            and current[2] == last_col
+        ):
+            current[3].append(span)
+        else:
+            current = [i, first_col, last_col, [span]]
+            blocks.append(current)
+
+    return [
+        {
+            "range": f"{rowcol_to_a1(first_row + 1, first_col + 1)}:"
+                     f"{rowcol_to_a1(first_row + len(rows), last_col + 1)}",
+            "values": rows,
+        }
+        for first_row, first_col, last_col, rows in blocks
+    ]
 
-# Load environment variables from .env file (assuming they are set externally, e.g., in a runner)
-load_dotenv()
 
 class SheetsHandler:
     def __init__(self):
@@ -15,25 +167,26 @@ class SheetsHandler:
         Initialize Google Sheets handler with credentials from environment variables.
         """
         self.client = None
+        self._credentials = None
+        # Opened once and reused by every read/write on this handler
+        self._spreadsheet = None
+        self._worksheets = {}
+        self._worksheets_loaded = False
+        # Guards the handle cache so tabs can be uploaded from several threads
+        self._lock = threading.RLock()
         self._authenticate()
     
+    @span("sheets.auth")
     def _authenticate(self):
         """
         Authenticate with Google Sheets API using service account credentials
         read directly from the GOOGLE_SERVICE_ACCOUNT_JSON environment variable.
         """
         try:
-            # 1. Get credentials JSON string from environment variable
-            credentials_json_string = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
+            from google.oauth2.service_account import Credentials
 
-            if not credentials_json_string:
-                raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON not found in environment variables.")
-            
-            # 2. Parse the JSON string into a Python dictionary (credentials info)
-            try:
-                credentials_info = json.loads(credentials_json_string)
-            except json.JSONDecodeError:
-                raise ValueError("GOOGLE_SERVICE_ACCOUNT_JSON is not a valid JSON string. Check formatting.")
+            # 1 + 2. Credentials JSON from the environment, parsed once per process
+            credentials_info = google_service_account_info()
 
             scopes = [
                 'https://www.googleapis.com/auth/spreadsheets',
@@ -45,7 +198,9 @@ class SheetsHandler:
                 credentials_info, 
                 scopes=scopes
             )
-            self.client = gspread.authorize(creds)
+            self._credentials = creds
+            # Every API call goes through the shared rate limiter / retry layer
+            self.client = gspread.authorize(creds, http_client=RateLimitedHTTPClient)
             print("✅ Successfully authenticated with Google Sheets API using service account JSON")
             
         except Exception as e:
@@ -53,7 +208,98 @@ class SheetsHandler:
             # Re-raise the error so the calling application knows initialization failed
             raise
     
-    def write_dataframe_to_sheet(self, df, sheet_name, clear_sheet=True):
+    def _get_spreadsheet(self):
+        """Opens the GOOGLE_SPREADSHEET_ID spreadsheet once and caches the handle."""
+        with self._lock:
+            if self._spreadsheet is None:
+                spreadsheet_id = get_env("GOOGLE_SPREADSHEET_ID")
+
+                if not spreadsheet_id:
+                    raise ValueError("GOOGLE_SPREADSHEET_ID not found in environment variables")
+
+                self._spreadsheet = self.client.open_by_key(spreadsheet_id)
+            return self._spreadsheet
+
+    def _load_worksheets(self):
+        """Caches every tab's handle/metadata with a single metadata request."""
+        with self._lock:
+            for worksheet in self._get_spreadsheet().worksheets():
+                self._worksheets[worksheet.title] = worksheet
+            self._worksheets_loaded = True
+
+    def prepare(self, reload=False):
+        """
+        Opens the spreadsheet and caches every tab handle up front.
+
+        Nothing here depends on the data being uploaded, so the runner calls
+        it in the background while the SQL query is still running. A
+        long-lived handler passes reload=True so tabs added, renamed or
+        deleted since the last run are picked up (one metadata request).
+        """
+        with self._lock:
+            if reload:
+                self._worksheets = {}
+                self._worksheets_loaded = False
+            if not self._worksheets_loaded:
+                with span("sheets.open"):
+                    self._load_worksheets()
+        return self
+
+    def refresh_credentials(self, min_remaining=timedelta(minutes=5)):
+        """
+        Refreshes the OAuth access token now if it expires within min_remaining.
+
+        google-auth would otherwise refresh it inside the first API call after
+        it expires, adding the token round trip to that run's upload.
+        Returns True if a refresh happened.
+        """
+        creds = self._credentials
+        if creds is None:
+            return False
+
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        if creds.token and creds.expiry and creds.expiry - now > min_remaining:
+            return False
+
+        from google.auth.transport.requests import Request
+
+        with span("sheets.token_refresh"):
+            creds.refresh(Request())
+        return True
+
+    def _get_worksheet(self, sheet_name):
+        """Cached worksheet lookup; raises gspread WorksheetNotFound like spreadsheet.worksheet()."""
+        with self._lock:
+            worksheet = self._worksheets.get(sheet_name)
+            if worksheet is None:
+                if self._worksheets_loaded:
+                    # Every tab is already cached, so it really does not exist
+                    raise gspread.exceptions.WorksheetNotFound(sheet_name)
+                worksheet = self._get_spreadsheet().worksheet(sheet_name)
+                self._worksheets[sheet_name] = worksheet
+            return worksheet
+
+    def _ensure_worksheet(self, sheet_name, rows, cols):
+        """Returns the tab, creating it or growing its grid to at least rows x cols."""
+        with self._lock:
+            try:
+                worksheet = self._get_worksheet(sheet_name)
+            except gspread.exceptions.WorksheetNotFound:
+                worksheet = self._get_spreadsheet().add_worksheet(
+                    title=sheet_name,
+                    rows=str(rows),
+                    cols=str(cols)
+                )
+                self._worksheets[sheet_name] = worksheet
+                print(f"Created new sheet: '{sheet_name}'")
+                return worksheet
+
+        if worksheet.row_count < rows or worksheet.col_count < cols:
+            worksheet.resize(rows=max(worksheet.row_count, rows), cols=max(worksheet.col_count, cols))
+        return worksheet
+
+    def write_dataframe_to_sheet(self, df, sheet_name, clear_sheet=True, diff=False):
         """
         Write a pandas DataFrame to a specific sheet/tab in a Google Spreadsheet.
         Uses SPREADSHEET_ID from environment variables.
@@ -62,41 +308,41 @@ class SheetsHandler:
             df (pd.DataFrame): The DataFrame to write
             sheet_name (str): The name of the sheet/tab to write to
             clear_sheet (bool): Whether to clear existing content first
+            diff (bool): Read the tab once and only send the cells that changed
+                (plus blanking of leftover rows) in a single batch_update,
+                instead of clearing and rewriting everything. Overrides clear_sheet.
         
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Get spreadsheet ID from environment variable
-            spreadsheet_id = os.getenv("GOOGLE_SPREADSHEET_ID")
-            
-            if not spreadsheet_id:
-                raise ValueError("GOOGLE_SPREADSHEET_ID not found in environment variables")
-            
-            # Open the spreadsheet
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            
-            # Try to get existing worksheet, or create if it doesn't exist
+            # Try to get existing worksheet (cached), or create if it doesn't exist
             try:
-                worksheet = spreadsheet.worksheet(sheet_name)
+                worksheet = self._get_worksheet(sheet_name)
                 print(f"Found existing sheet: '{sheet_name}'")
             except gspread.exceptions.WorksheetNotFound:
                 # Calculate required rows and columns for new sheet creation
                 rows = str(len(df) + 1)
                 cols = str(len(df.columns))
-                worksheet = spreadsheet.add_worksheet(
+                worksheet = self._get_spreadsheet().add_worksheet(
                     title=sheet_name, 
                     rows=rows, 
                     cols=cols
                 )
+                self._worksheets[sheet_name] = worksheet
                 print(f"Created new sheet: '{sheet_name}'")
             
+            if diff:
+                return self._write_diff(worksheet, df, sheet_name)
+
             # Clear existing content if requested
             if clear_sheet:
                 worksheet.clear()
                 print(f"Cleared existing content in '{sheet_name}'")
             
             # Write DataFrame to sheet
+            from gspread_dataframe import set_with_dataframe
+
             set_with_dataframe(worksheet, df, include_index=False, include_column_header=True)
             
             print(f"✅ Successfully wrote {len(df)} rows to '{sheet_name}' tab")
@@ -106,6 +352,224 @@ class SheetsHandler:
             print(f"🚨 ERROR writing to Google Sheets: {e}")
             return False
 
+    def _write_diff(self, worksheet, df, sheet_name):
+        """Sends only the changed cell ranges of df to the worksheet."""
+        new_values = _dataframe_to_values(df)
+        old_values = worksheet.get_all_values(
+            value_render_option=UNFORMATTED_READ["valueRenderOption"],
+            date_time_render_option=UNFORMATTED_READ["dateTimeRenderOption"],
+        )
+
+        data = _diff_ranges(old_values, new_values)
+        if not data:
+            print(f"✅ '{sheet_name}' already up to date ({len(df)} rows), nothing sent")
+            return True
+
+        # Grow the grid first if the new data does not fit
+        needed_rows, needed_cols = len(new_values), len(new_values[0])
+        if worksheet.row_count < needed_rows or worksheet.col_count < needed_cols:
+            worksheet.resize(
+                rows=max(worksheet.row_count, needed_rows),
+                cols=max(worksheet.col_count, needed_cols),
+            )
+
+        worksheet.batch_update(data, value_input_option="USER_ENTERED")
+
+        changed_cells = sum(len(block["values"]) * len(block["values"][0]) for block in data)
+        print(f"✅ Successfully wrote {len(df)} rows to '{sheet_name}' tab "
+              f"({changed_cells} changed cells in {len(data)} ranges)")
+        return True
+
+    def write_dataframes_to_sheets(self, frames, diff=False):
+        """
+        Write several DataFrames, one per tab, with a single values batch update.
+        Uses SPREADSHEET_ID from environment variables.
+
+        The spreadsheet and worksheet handles are opened once and cached, and
+        every tab's rows go out in one `values_batch_update` request (plus one
+        `values_batch_clear`, or one `values_batch_get` in diff mode).
+        Safe to call from several threads at once for disjoint sets of tabs.
+
+        Args:
+            frames (dict): {sheet_name: DataFrame} to upload
+            diff (bool): Only send the changed cells of each tab (see write_dataframe_to_sheet)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            spreadsheet = self._get_spreadsheet()
+            self.prepare()
+
+            new_values = {}
+            for sheet_name, df in frames.items():
+                with span("sheets.serialize"):
+                    new_values[sheet_name] = _dataframe_to_values(df)
+                count("sheets.cells", (len(df) + 1) * len(df.columns))
+                self._ensure_worksheet(sheet_name, len(df) + 1, len(df.columns))
+            checkpoint("serialize")
+
+            tab_ranges = [absolute_range_name(sheet_name) for sheet_name in frames]
+            data = []
+
+            if diff:
+                with span("sheets.read"):
+                    response = spreadsheet.values_batch_get(tab_ranges, params=UNFORMATTED_READ)
+                value_ranges = response.get("valueRanges", [])
+                for sheet_name, value_range in zip(frames, value_ranges):
+                    for block in _diff_ranges(value_range.get("values", []), new_values[sheet_name]):
+                        data.append({
+                            "range": absolute_range_name(sheet_name, block["range"]),
+                            "values": block["values"],
+                        })
+            else:
+                with span("sheets.clear"):
+                    spreadsheet.values_batch_clear(body={"ranges": tab_ranges})
+                for sheet_name, values in new_values.items():
+                    end_cell = rowcol_to_a1(len(values), len(values[0]))
+                    data.append({
+                        "range": absolute_range_name(sheet_name, f"A1:{end_cell}"),
+                        "values": values,
+                    })
+
+            if data:
+                with span("sheets.write"):
+                    spreadsheet.values_batch_update(body={
+                        "valueInputOption": "USER_ENTERED",
+                        "data": data,
+                    })
+
+            for sheet_name, df in frames.items():
+                print(f"✅ Successfully wrote {len(df)} rows to '{sheet_name}' tab")
+            print(f"   ({len(data)} ranges across {len(frames)} tabs in one batch update)")
+            return True
+
+        except Exception as e:
+            print(f"🚨 ERROR writing to Google Sheets: {e}")
+            return False
+
+    def append_dataframe_to_sheet(self, df, sheet_name):
+        """
+        Append the DataFrame's rows (no header) below the tab's existing data
+        with one values.append request; the API finds the end of the table.
+
+        Args:
+            df (pd.DataFrame): Rows to add, in the tab's column order
+            sheet_name (str): An existing tab
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            worksheet = self._get_worksheet(sheet_name)
+
+            with span("sheets.serialize"):
+                rows = _dataframe_to_values(df)[1:]
+            checkpoint("serialize")
+            if rows:
+                count("sheets.cells", len(df) * len(df.columns))
+                with span("sheets.append"):
+                    worksheet.append_rows(rows, value_input_option="USER_ENTERED", table_range="A1")
+
+            print(f"✅ Successfully appended {len(df)} rows to '{sheet_name}' tab")
+            return True
+
+        except Exception as e:
+            print(f"🚨 ERROR appending to Google Sheets: {e}")
+            return False
+
+    def copy_tab_values(self, source_name, sheet_name, rows, cols):
+        """
+        Replace the tab's content with the top-left rows x cols of another tab,
+        copied server-side with one batch_update (clear + copyPaste), so no
+        cell data is uploaded.
+
+        Args:
+            source_name (str): An existing tab to copy from
+            sheet_name (str): The tab to overwrite (created if missing)
+            rows (int): Rows to copy, header included
+            cols (int): Columns to copy
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            source = self._get_worksheet(source_name)
+            target = self._ensure_worksheet(sheet_name, rows, cols)
+            grid = {"startRowIndex": 0, "endRowIndex": rows, "startColumnIndex": 0, "endColumnIndex": cols}
+
+            with span("sheets.copy"):
+                self._get_spreadsheet().batch_update({"requests": [
+                    {"updateCells": {"range": {"sheetId": target.id}, "fields": "userEnteredValue"}},
+                    {"copyPaste": {
+                        "source": {"sheetId": source.id, **grid},
+                        "destination": {"sheetId": target.id, **grid},
+                        # Values plus their date formats
+                        "pasteType": "PASTE_NORMAL",
+                    }},
+                ]})
+
+            print(f"✅ Copied {rows - 1} rows from '{source_name}' to '{sheet_name}' tab")
+            return True
+
+        except Exception as e:
+            print(f"🚨 ERROR copying between Google Sheets tabs: {e}")
+            return False
+
+    def read_tab_metadata(self, key):
+        """
+        Developer metadata value stored under `key` on each tab, as {sheet_name: value}.
+        One metadata request covers every tab.
+
+        Returns:
+            dict: Tabs that carry the key (empty if reading fails)
+        """
+        try:
+            metadata = self._get_spreadsheet().fetch_sheet_metadata(params={
+                "fields": "sheets(properties(sheetId,title),developerMetadata(metadataKey,metadataValue))"
+            })
+            values = {}
+            for sheet in metadata.get("sheets", []):
+                for entry in sheet.get("developerMetadata", []):
+                    if entry.get("metadataKey") == key:
+                        values[sheet["properties"]["title"]] = entry.get("metadataValue")
+            return values
+
+        except Exception as e:
+            print(f"🚨 ERROR reading developer metadata: {e}")
+            return {}
+
+    def write_tab_metadata(self, key, values):
+        """
+        Replaces the developer metadata value under `key` on each tab in `values`
+        ({sheet_name: value}) with a single batch_update.
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        try:
+            requests = []
+            for sheet_name, value in values.items():
+                sheet_id = self._get_worksheet(sheet_name).id
+                requests.append({"deleteDeveloperMetadata": {"dataFilter": {"developerMetadataLookup": {
+                    "metadataKey": key,
+                    "metadataLocation": {"sheetId": sheet_id},
+                }}}})
+                requests.append({"createDeveloperMetadata": {"developerMetadata": {
+                    "metadataKey": key,
+                    "metadataValue": value,
+                    "location": {"sheetId": sheet_id},
+                    "visibility": "DOCUMENT",
+                }}})
+
+            if requests:
+                self._get_spreadsheet().batch_update({"requests": requests})
+            return True
+
+        except Exception as e:
+            print(f"🚨 ERROR writing developer metadata: {e}")
+            return False
+
     def read_sheet_to_dataframe(self, sheet_name):
         """
         Reads data from a specific sheet/tab into a pandas DataFrame.
@@ -118,13 +582,7 @@ class SheetsHandler:
             pd.DataFrame or None: The DataFrame containing the sheet data, or None if reading fails.
         """
         try:
-            spreadsheet_id = os.getenv("GOOGLE_SPREADSHEET_ID")
-            
-            if not spreadsheet_id:
-                raise ValueError("GOOGLE_SPREADSHEET_ID not found in environment variables")
-            
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = self._get_worksheet(sheet_name)
             
             # Get all values from the worksheet
             data = worksheet.get_all_values()
@@ -159,13 +617,7 @@ class SheetsHandler:
             bool: True if successful, False otherwise
         """
         try:
-            spreadsheet_id = os.getenv("GOOGLE_SPREADSHEET_ID")
-            
-            if not spreadsheet_id:
-                raise ValueError("GOOGLE_SPREADSHEET_ID not found in environment variables")
-            
-            spreadsheet = self.client.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
+            worksheet = self._get_worksheet(sheet_name)
             
             # Helper to convert Excel-style column letter to 1-based index (A=1, B=2, ...)
             col_index = ord(start_cell[0].upper()) - 64
@@ -176,6 +628,8 @@ class SheetsHandler:
                  raise ValueError("Invalid start_cell format. Expected format like 'A1'.")
 
             # Update starting from specific cell
+            from gspread_dataframe import set_with_dataframe
+
             set_with_dataframe(
                 worksheet, 
                 df, 
@@ -0,0 +1,168 @@
+# src/sql_templates.py
+"""
+Template layer over the queries in sql_query/.
+
+Queries name their parameters (`:start`, `:end`) instead of relying on the
+order of pyodbc `?` markers; bind() turns them into `?` plus the values in
+marker order right before execution, so the server still gets a
+parameterized statement whose plan is reused. Files that still use plain
+`?` markers keep working with a positional params list.
+
+On top of a base query:
+  rollup_query  wraps it as a derived table and aggregates it server-side
+                with GROUP BY (or GROUPING SETS) over named keys
+                (technician, hour, case)
+  page_query    wraps it with TOP, or ORDER BY ... OFFSET/FETCH paging
+
+Both strip the base query's trailing ORDER BY, which SQL Server does not
+allow inside a derived table. Nothing here imports pandas or pyodbc.
+"""
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+Params = Union[Mapping[str, Any], Sequence[Any], None]
+
+# String literals, quoted/bracketed identifiers, comments and `::` are copied
+# as-is, so '12:00' or a `-- note: ...` comment never becomes a parameter
+_TOKENS = re.compile(
+    r"(?P<skip>'(?:[^']|'')*'|\"[^\"]*\"|\[[^\]]*\]|--[^\n]*|/\*.*?\*/|::)"
+    r"|:(?P<name>[A-Za-z_]\w*)",
+    re.DOTALL,
+)
+
+# Trailing ORDER BY (not allowed inside a derived table) plus the final semicolon
+_TRAILING_ORDER_BY = re.compile(r"\s+ORDER\s+BY\s+[^;()]*;?\s*$", re.IGNORECASE)
+
+# Rollup keys over the task_by_tech_eff.sql columns: output column → expression on the derived table
+ROLLUP_KEYS: Dict[str, Tuple[str, str]] = {
+    "technician": ("CompletedBy", "q.CompletedBy"),
+    "hour": ("Hour", "DATEPART(HOUR, q.CompleteDate)"),
+    "case": ("CaseNumber", "q.CaseNumber"),
+}
+
+# What every rollup row carries; matches aggregations.summarize_by_technician
+TASK_MEASURES: Dict[str, str] = {
+    "Tasks": "COUNT(*)",
+    "TotalDuration": "SUM(q.Duration)",
+    "DistinctCases": "COUNT(DISTINCT q.CaseNumber)",
+}
+
+
+def window_params(start: datetime, end: datetime) -> Dict[str, datetime]:
+    """The named [start, end) parameters of the report queries."""
+    return {"start": start, "end": end}
+
+
+def parameter_names(query: str) -> List[str]:
+    """Named parameters in the order they appear (repeats included)."""
+    return [m.group("name") for m in _TOKENS.finditer(query) if m.group("name")]
+
+
+def render(query: str, params: Mapping[str, Any]) -> Tuple[str, List[Any]]:
+    """
+    Replaces every `:name` with `?` and returns the values in marker order.
+
+    A name used twice is bound twice; a list or tuple value expands to one
+    marker per item (for `IN (:ids)`). Missing names raise KeyError.
+    """
+    values: List[Any] = []
+
+    def substitute(match: "re.Match") -> str:
+        name = match.group("name")
+        if name is None:
+            return match.group(0)
+        if name not in params:
+            raise KeyError(f"SQL parameter ':{name}' has no value (got {sorted(params)})")
+        value = params[name]
+        if isinstance(value, (list, tuple)):
+            if not value:
+                raise ValueError(f"SQL parameter ':{name}' is an empty list")
+            values.extend(value)
+            return ", ".join("?" * len(value))
+        values.append(value)
+        return "?"
+
+    return _TOKENS.sub(substitute, query), values
+
+
+def bind(query: str, params: Params) -> Tuple[str, Optional[Sequence[Any]]]:
+    """(SQL with `?` markers, positional values): named params are rendered, positional ones pass through."""
+    if isinstance(params, Mapping):
+        return render(query, params)
+    return query, params
+
+
+def base_query(query: str) -> str:
+    """The query without its trailing ORDER BY and semicolon, ready to nest."""
+    return _TRAILING_ORDER_BY.sub("", query.strip()).rstrip().rstrip(";")
+
+
+def rollup_query(
+    query: str,
+    grouping_sets: Sequence[Sequence[str]],
+    measures: Mapping[str, str] = TASK_MEASURES,
+) -> str:
+    """
+    Aggregates `query` on the server, one row per group.
+
+    One grouping set is a plain GROUP BY; several become GROUPING SETS, and
+    keys a set rolls up come back as NULL on that set's rows. For example
+    [("technician",), ("technician", "hour")] returns a total row per
+    technician (Hour NULL) plus one row per technician and hour.
+    """
+    if not grouping_sets:
+        raise ValueError("rollup_query needs at least one grouping set")
+    unknown = {key for keys in grouping_sets for key in keys} - set(ROLLUP_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown rollup key(s) {sorted(unknown)} (expected one of {sorted(ROLLUP_KEYS)})")
+
+    # Keys in first-seen order, so the output columns follow the grouping sets
+    keys = list(dict.fromkeys(key for keys in grouping_sets for key in keys))
+    select = [f"{ROLLUP_KEYS[key][1]} AS [{ROLLUP_KEYS[key][0]}]" for key in keys]
+    select += [f"{expression} AS [{name}]" for name, expression in measures.items()]
+
+    if len(grouping_sets) == 1:
+        group_by = ", ".join(ROLLUP_KEYS[key][1] for key in grouping_sets[0])
+    else:
+        sets = ", ".join("(" + ", ".join(ROLLUP_KEYS[key][1] for key in keys) + ")" for keys in grouping_sets)
+        group_by = f"GROUPING SETS ({sets})"
+
+    columns = ",\n    ".join(select)
+    return f"SELECT\n    {columns}\nFROM (\n{base_query(query)}\n) AS q\nGROUP BY {group_by};"
+
+
+def page_query(
+    query: str,
+    order_by: Sequence[str] = (),
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+) -> str:
+    """
+    Limits `query` to `limit` rows with TOP, or pages it with OFFSET/FETCH
+    when an offset is given (which SQL Server only allows with ORDER BY).
+
+    `order_by` names output columns of `query` (e.g. "TotalDuration DESC").
+    The limit and offset are bound as the :page_limit / :page_offset
+    parameters, so pass page_params(limit, offset) along with the query's own.
+    """
+    order = f"\nORDER BY {', '.join(order_by)}" if order_by else ""
+    base = base_query(query)
+    if offset is None:
+        top = "TOP (:page_limit) " if limit is not None else ""
+        return f"SELECT {top}*\nFROM (\n{base}\n) AS p{order};"
+
+    if not order_by:
+        raise ValueError("Paging with an offset needs order_by columns")
+    fetch = "\nFETCH NEXT :page_limit ROWS ONLY" if limit is not None else ""
+    return f"SELECT *\nFROM (\n{base}\n) AS p{order}\nOFFSET :page_offset ROWS{fetch};"
+
+
+def page_params(limit: Optional[int] = None, offset: Optional[int] = None) -> Dict[str, int]:
+    """Values for the placeholders page_query adds."""
+    params = {}
+    if limit is not None:
+        params["page_limit"] = limit
+    if offset is not None:
+        params["page_offset"] = offset
+    return params
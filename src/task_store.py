@@ -0,0 +1,216 @@
+# src/task_store.py
+import json
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+
+from .dates import normalize_dates, window_slice
+from .db_handler import apply_column_dtypes, concat_frames, iter_sql_dataframes
+from .sql_templates import window_params
+
+# --- Paths ---
+BASE_DIR = Path(__file__).parent
+DEFAULT_STORE_DIR = BASE_DIR.parent / ".cache" / "task_store"
+
+DATE_COL = 'CompleteDate'
+
+# Re-fetch a little before the high-water mark so rows committed late with a
+# slightly older CompleteDate are still picked up (the range is replaced, not appended)
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+
+# Day partitions older than this are deleted on every sync
+RETENTION_DAYS = 10
+
+
+def _parse_dates(chunk: pd.DataFrame) -> pd.DataFrame:
+    return normalize_dates(chunk, DATE_COL)
+
+
+class TaskStore:
+    """
+    Local, day-partitioned Parquet copy of the task_by_tech_eff.sql rows.
+
+    The store remembers the latest CompleteDate it has extracted (the
+    high-water mark) and the earliest time it holds complete data for, so
+    later runs only fetch rows newer than what is already on disk.
+    """
+
+    def __init__(self, root: Path = DEFAULT_STORE_DIR):
+        self.root = Path(root)
+        self.state_path = self.root / "state.json"
+
+    # ---------------------------------------------------------------
+    # State
+    # ---------------------------------------------------------------
+    def _read_state(self) -> dict:
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+        return {
+            key: datetime.fromisoformat(value)
+            for key, value in state.items()
+            if value is not None
+        }
+
+    def _write_state(self, high_water_mark: Optional[datetime], covered_from: Optional[datetime]):
+        self.root.mkdir(parents=True, exist_ok=True)
+        state = {
+            "high_water_mark": high_water_mark.isoformat() if high_water_mark else None,
+            "covered_from": covered_from.isoformat() if covered_from else None,
+        }
+        tmp_path = self.state_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def high_water_mark(self) -> Optional[datetime]:
+        """Latest CompleteDate extracted so far, or None for an empty store."""
+        return self._read_state().get("high_water_mark")
+
+    # ---------------------------------------------------------------
+    # Partitions
+    # ---------------------------------------------------------------
+    def _schema_path(self) -> Path:
+        # Zero-row file that remembers the column layout for empty windows
+        return self.root / "_schema.parquet"
+
+    def _partition_path(self, day: date) -> Path:
+        return self.root / f"{DATE_COL}={day:%Y-%m-%d}.parquet"
+
+    def _partition_days(self, start: datetime, end: datetime) -> List[date]:
+        """Every calendar day touched by the [start, end) range."""
+        first = start.date()
+        last = (end - timedelta(microseconds=1)).date()
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def _read_partition(self, day: date) -> Optional[pd.DataFrame]:
+        path = self._partition_path(day)
+        if not path.exists():
+            return None
+        return apply_column_dtypes(pd.read_parquet(path))
+
+    def _write_partition(self, day: date, df: pd.DataFrame):
+        path = self._partition_path(day)
+        if df.empty:
+            path.unlink(missing_ok=True)
+            return
+        tmp_path = path.with_suffix(".tmp")
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _replace_range(self, df: pd.DataFrame, start: datetime, end: datetime):
+        """Replaces every stored row in [start, end) with the rows in df."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Midnight of each row's day, compared as datetime64 (no per-row date objects)
+        day_keys = df[DATE_COL].dt.normalize()
+
+        for day in self._partition_days(start, end):
+            existing = self._read_partition(day)
+            new_rows = df[day_keys == pd.Timestamp(day)]
+
+            if existing is not None:
+                in_range = (existing[DATE_COL] >= start) & (existing[DATE_COL] < end)
+                kept = existing[~in_range]
+                new_rows = concat_frames([kept, new_rows]) if not kept.empty else new_rows
+
+            self._write_partition(day, new_rows.sort_values(DATE_COL, kind="stable"))
+
+    def prune(self, keep_from: date):
+        """Deletes day partitions older than keep_from."""
+        for path in self.root.glob(f"{DATE_COL}=*.parquet"):
+            day = date.fromisoformat(path.stem.split("=", 1)[1])
+            if day < keep_from:
+                path.unlink(missing_ok=True)
+
+    # ---------------------------------------------------------------
+    # Sync / load
+    # ---------------------------------------------------------------
+    def sync(self, sql_query_file: str, start: datetime, end: datetime) -> bool:
+        """
+        Makes sure the store holds every row in [start, end).
+
+        Only rows newer than the high-water mark (minus a small overlap) are
+        fetched when the store already covers `start`; otherwise the whole
+        window is fetched once and becomes the new covered range.
+
+        Returns:
+            bool: True if the store is up to date, False if the fetch failed
+        """
+        state = self._read_state()
+        high_water_mark = state.get("high_water_mark")
+        covered_from = state.get("covered_from")
+
+        if covered_from is None or high_water_mark is None or start < covered_from:
+            # Cold store or a window older than what we hold: fetch it all,
+            # extending to the old high-water mark so coverage stays contiguous
+            fetch_start = start
+            fetch_end = max(end, high_water_mark) if high_water_mark else end
+            covered_from = start
+            print(f"Task store: full fetch {fetch_start:%Y-%m-%d %H:%M} → {fetch_end:%Y-%m-%d %H:%M}")
+        else:
+            fetch_start = high_water_mark - INCREMENTAL_OVERLAP
+            fetch_end = end
+            if fetch_end <= fetch_start:
+                print(f"Task store: up to date (high-water mark {high_water_mark:%Y-%m-%d %H:%M:%S})")
+                return True
+            print(f"Task store: incremental fetch since {high_water_mark:%Y-%m-%d %H:%M:%S}")
+
+        # Parse dates chunk by chunk as rows stream in; a failed or
+        # column-less fetch leaves the store untouched so the next run
+        # retries from the same mark
+        try:
+            chunks = list(iter_sql_dataframes(
+                sql_query_file,
+                params=window_params(fetch_start, fetch_end),
+                transform=_parse_dates,
+            ))
+        except Exception as e:
+            print(f"Task store: fetch failed ({e}), high-water mark not advanced.")
+            return False
+
+        if not chunks:
+            print("Task store: no result set returned, high-water mark not advanced.")
+            return False
+
+        data_df = concat_frames(chunks)
+
+        self._replace_range(data_df, fetch_start, fetch_end)
+        data_df.head(0).to_parquet(self._schema_path(), index=False)
+
+        if not data_df.empty:
+            newest = data_df[DATE_COL].max().to_pydatetime()
+            high_water_mark = max(high_water_mark, newest) if high_water_mark else newest
+        elif high_water_mark is None:
+            # Nothing in the window yet: we still know it is complete up to its start
+            high_water_mark = fetch_start
+
+        keep_from = date.today() - timedelta(days=RETENTION_DAYS)
+        self.prune(keep_from)
+        if covered_from.date() < keep_from:
+            covered_from = datetime.combine(keep_from, datetime.min.time())
+
+        self._write_state(high_water_mark, covered_from)
+        print(f"Task store: stored {len(data_df):,} rows, high-water mark now {high_water_mark:%Y-%m-%d %H:%M:%S}")
+        return True
+
+    def load(self, start: datetime, end: datetime) -> pd.DataFrame:
+        """Reads every stored row in [start, end) from the day partitions."""
+        frames = []
+        for day in self._partition_days(start, end):
+            part = self._read_partition(day)
+            if part is not None:
+                frames.append(part)
+
+        if not frames:
+            schema_path = self._schema_path()
+            return apply_column_dtypes(pd.read_parquet(schema_path)) if schema_path.exists() else pd.DataFrame()
+
+        # Partitions are stored sorted by CompleteDate, so this is a searchsorted slice
+        data_df = concat_frames(frames)
+        return window_slice(data_df, (start, end), DATE_COL).reset_index(drop=True)
@@ -0,0 +1,207 @@
+# tests/test_sheets_client.py
+"""
+RequestScheduler / RateLimitedHTTPClient against a local fake Sheets server.
+
+Run from the project root:
+    uv run python -m unittest discover tests
+
+The server answers each path from a script of (status, headers, delay) responses;
+the scheduler gets a fake clock and sleep, so backoff and throttling are
+checked by the delays they ask for instead of by waiting.
+"""
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from gspread.exceptions import APIError
+
+from src.sheets_client import RateLimitedHTTPClient, RequestScheduler, TokenBucket
+
+
+class FakeClock:
+    """monotonic() stand-in that only moves when the code under test sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    # path -> responses still to send, as (status, headers, delay before answering)
+    script = {}
+    hits = {}
+    lock = threading.Lock()
+
+    def _answer(self):
+        with self.lock:
+            self.hits[self.path] = self.hits.get(self.path, 0) + 1
+            queue = self.script.get(self.path) or []
+            status, headers, delay = queue.pop(0) if queue else (200, {}, 0.0)
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        if delay:
+            time.sleep(delay)
+
+        body = json.dumps({"error": {"code": status, "message": "scripted", "status": "SCRIPTED"}}
+                          if status >= 400 else {"ok": True}).encode("utf-8")
+        try:
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client already gave up on a delayed answer (read timeout)
+            pass
+
+    do_GET = do_POST = _answer
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SchedulerAgainstFakeServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), ScriptedHandler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        ScriptedHandler.script = {}
+        ScriptedHandler.hits = {}
+        self.clock = FakeClock()
+
+    def client(self, **scheduler_options) -> RateLimitedHTTPClient:
+        """A client with its own scheduler, so tests don't share the process-wide one."""
+        options = {"requests_per_minute": 6000, "rng": lambda: 0.0}
+        options.update(scheduler_options)
+        scheduler = RequestScheduler(clock=self.clock, sleep=self.clock.sleep, **options)
+        client_class = type("TestClient", (RateLimitedHTTPClient,), {"scheduler": scheduler})
+        return client_class(auth=None, session=requests.Session())
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def test_429_twice_then_success(self):
+        ScriptedHandler.script["/values"] = [(429, {}, 0.0), (429, {}, 0.0)]
+        client = self.client()
+
+        response = client.request("get", self.url("/values"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ScriptedHandler.hits["/values"], 3)
+        self.assertEqual(client.scheduler.retries, 2)
+        # Exponential backoff from base_delay=1 (jitter pinned to 0)
+        self.assertEqual(self.clock.sleeps, [1.0, 2.0])
+
+    def test_retry_after_is_honored(self):
+        ScriptedHandler.script["/values"] = [(429, {"Retry-After": "7"}, 0.0), (503, {"Retry-After": "3"}, 0.0)]
+        client = self.client()
+
+        client.request("get", self.url("/values"))
+
+        self.assertEqual(ScriptedHandler.hits["/values"], 3)
+        self.assertEqual(self.clock.sleeps, [7.0, 3.0])
+
+    def test_400_is_raised_without_retry(self):
+        ScriptedHandler.script["/values"] = [(400, {}, 0.0)]
+        client = self.client()
+
+        with self.assertRaises(APIError) as raised:
+            client.request("get", self.url("/values"))
+
+        self.assertEqual(raised.exception.response.status_code, 400)
+        self.assertEqual(ScriptedHandler.hits["/values"], 1)
+        self.assertEqual(client.scheduler.retries, 0)
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_gives_up_after_max_retries(self):
+        ScriptedHandler.script["/values"] = [(500, {}, 0.0)] * 4
+        client = self.client(max_retries=2)
+
+        with self.assertRaises(APIError):
+            client.request("get", self.url("/values"))
+
+        self.assertEqual(ScriptedHandler.hits["/values"], 3)
+
+    def test_token_bucket_throttles_bursts(self):
+        # 60/min: a burst of 10 (ten seconds of quota), then one request per second
+        client = self.client(requests_per_minute=60)
+
+        for _ in range(13):
+            client.request("get", self.url("/values"))
+
+        self.assertEqual(ScriptedHandler.hits["/values"], 13)
+        self.assertEqual(len(self.clock.sleeps), 3)
+        for waited in self.clock.sleeps:
+            self.assertAlmostEqual(waited, 1.0)
+        self.assertAlmostEqual(self.clock.now, 3.0)
+
+    def test_read_timeout_retries_reads_but_not_appends(self):
+        slow = (200, {}, 0.5)
+        ScriptedHandler.script["/values"] = [slow]
+        ScriptedHandler.script["/values/A1:append"] = [slow]
+        client = self.client()
+        client.set_timeout(0.1)
+
+        client.request("get", self.url("/values"))
+        self.assertEqual(ScriptedHandler.hits["/values"], 2)
+
+        # The server may already have applied the append, so it is not resent
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            client.request("post", self.url("/values/A1:append"), json={"values": [[1]]})
+        self.assertEqual(ScriptedHandler.hits["/values/A1:append"], 1)
+
+    def test_429_on_append_is_retried(self):
+        ScriptedHandler.script["/values/A1:append"] = [(429, {}, 0.0)]
+        client = self.client()
+
+        client.request("post", self.url("/values/A1:append"), json={"values": [[1]]})
+
+        self.assertEqual(ScriptedHandler.hits["/values/A1:append"], 2)
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+        for _ in range(3):
+            bucket.acquire()
+        self.assertEqual(clock.sleeps, [])
+
+        bucket.acquire()
+        self.assertEqual(clock.sleeps, [0.5])
+
+    def test_refill_is_capped_at_capacity(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=1.0, capacity=2, clock=clock, sleep=clock.sleep)
+
+        clock.now += 100
+        for _ in range(3):
+            bucket.acquire()
+
+        self.assertEqual(clock.sleeps, [1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()